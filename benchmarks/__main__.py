@@ -0,0 +1,41 @@
+"""Supersql benchmarks, run from the repository root
+
+    python -m benchmarks                          # run everything
+    python -m benchmarks -k compile rows/          # only names containing any of these
+    python -m benchmarks --save local             # store results in baselines/local.json
+    python -m benchmarks --compare local          # change against baselines/local.json
+
+Comparing exits non zero when a benchmark got slower than the tolerance allows.
+Baselines are only comparable on the machine and interpreter that recorded them.
+"""
+from argparse import ArgumentParser
+from sys import exit
+
+from . import bench_query, bench_results  # noqa: F401 registers the benchmarks
+from .runner import REGISTRY, compare, run, save
+
+
+def main():
+    parser = ArgumentParser(prog='python -m benchmarks')
+    parser.add_argument('-k', nargs='*', default=[], help='run benchmarks whose name contains any of these')
+    parser.add_argument('--max-records', type=int, default=1000000, help='skip benchmarks sized over this many records or rows')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--target', type=float, default=0.05, help='seconds each timing round runs for')
+    parser.add_argument('--save', metavar='BASELINE')
+    parser.add_argument('--compare', metavar='BASELINE')
+    parser.add_argument('--tolerance', type=float, default=0.1, help='slowdown ratio reported as a regression')
+    options = parser.parse_args()
+
+    names = [
+        name for name in REGISTRY
+        if (not options.k or any(k in name for k in options.k))
+        and int(name.rpartition('-')[2] if name.rpartition('-')[2].isdigit() else 0) <= options.max_records
+    ]
+    print(f'{"benchmark":<48} {"best":>17} {"median":>17}')
+    results = run(names, options.repeat, options.target)
+    if options.save: save(options.save, results)
+    if options.compare and compare(options.compare, results, options.tolerance): exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+from contextlib import redirect_stdout
+from json import dump, load
+from os import devnull, path
+from platform import platform, python_version
+from statistics import median
+from time import perf_counter
+from typing import Callable, Dict, List, Tuple
+
+
+BASELINES = path.join(path.dirname(__file__), 'baselines')
+
+# name -> setup, setup runs untimed and returns the callable being measured
+REGISTRY: Dict[str, Callable[[], Callable[[], object]]] = {}
+
+
+def bench(name: str):
+    """Register a benchmark setup under name"""
+    def register(setup: Callable[[], Callable[[], object]]):
+        if name in REGISTRY: raise ValueError(f'Benchmark {name} is registered twice')
+        REGISTRY[name] = setup
+        return setup
+    return register
+
+
+def measure(fn: Callable[[], object], repeat: int = 5, target: float = 0.05) -> Tuple[float, float, int]:
+    """Seconds per call (best, median) over repeat rounds, each round calling fn as many
+    times as it takes to run for about target seconds"""
+    number = 1
+    while True:
+        started = perf_counter()
+        for _ in range(number): fn()
+        elapsed = perf_counter() - started
+        if elapsed >= target or number >= 1 << 20: break
+        number *= 2 if elapsed < target / 10 else max(2, int(target / elapsed) + 1)
+    rounds = [elapsed / number]
+    for _ in range(repeat - 1):
+        started = perf_counter()
+        for _ in range(number): fn()
+        rounds.append((perf_counter() - started) / number)
+    return min(rounds), median(rounds), number
+
+
+def run(names: List[str], repeat: int = 5, target: float = 0.05) -> Dict[str, Dict[str, float]]:
+    results = {}
+    with open(devnull, 'w') as sink:
+        for name in names:
+            # the measured code never gets to write to the terminal, only the report does
+            with redirect_stdout(sink):
+                best, middle, number = measure(REGISTRY[name](), repeat, target)
+            results[name] = {'best': best, 'median': middle, 'number': number}
+            print(f'{name:<48} {best * 1e6:>14.2f} us {middle * 1e6:>14.2f} us')
+    return results
+
+
+def save(name: str, results: Dict[str, Dict[str, float]]):
+    with open(path.join(BASELINES, f'{name}.json'), 'w') as f:
+        dump({'python': python_version(), 'platform': platform(), 'results': results}, f, indent=2, sort_keys=True)
+
+
+def compare(name: str, results: Dict[str, Dict[str, float]], tolerance: float = 0.1) -> List[str]:
+    """Print the change against a saved baseline and return the regressed benchmarks,
+    those whose best time grew by more than tolerance"""
+    with open(path.join(BASELINES, f'{name}.json')) as f:
+        baseline = load(f)['results']
+    regressions = []
+    for bench, result in results.items():
+        if bench not in baseline: continue
+        change = result['best'] / baseline[bench]['best'] - 1
+        flag = ''
+        if change > tolerance:
+            flag = '  REGRESSION'
+            regressions.append(bench)
+        print(f'{bench:<48} {change:>+9.1%}{flag}')
+    return regressions
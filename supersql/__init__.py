@@ -2,8 +2,9 @@ from supersql.core import Supersql
 from supersql.column import Column
 from supersql.table import Table
 from supersql.query import Query
-from supersql.results import Rows, Row
+from supersql.results import Page, Rows, Row
+from supersql.template import Param, Template
 
 
 __version__ = "2023.4.1"
-__all__ = ['Supersql', 'Column', 'Table', 'Query', 'Rows', 'Row',]
+__all__ = ['Supersql', 'Column', 'Table', 'Query', 'Rows', 'Row', 'Page', 'Param', 'Template',]
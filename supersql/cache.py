@@ -0,0 +1,119 @@
+from collections import OrderedDict
+from time import monotonic
+from typing import Any, Dict, Hashable, Iterable
+
+
+MISSING = object()
+
+
+class LRU(object):
+    """Bounded least recently used mapping with hit and miss counters.
+
+    Used by Supersql to remember compiled SQL text per query fingerprint so
+    that identical builder chains skip rendering entirely.
+    """
+    def __init__(self, maxsize: int = 256):
+        if not isinstance(maxsize, int) or maxsize < 0:
+            raise ValueError('LRU maxsize must be a positive integer or zero to disable caching')
+        self._data = OrderedDict()
+        self._maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._data
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    @property
+    def maxsize(self) -> int:
+        return self._maxsize
+
+    def clear(self):
+        self._data.clear()
+        self.hits = self.misses = self.evictions = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        value = self._data.get(key, MISSING)
+        if value is MISSING:
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def info(self) -> Dict[str, int]:
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'size': len(self._data),
+            'maxsize': self._maxsize,
+        }
+
+    def peek(self, key: Hashable, default: Any = None) -> Any:
+        """Lookup without touching recency or the hit and miss counters"""
+        return self._data.get(key, default)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        return self._data.pop(key, default)
+
+    def put(self, key: Hashable, value: Any) -> Any:
+        if not self._maxsize: return value
+        data = self._data
+        data[key] = value
+        data.move_to_end(key)
+        while len(data) > self._maxsize:
+            data.popitem(last=False)
+            self.evictions += 1
+        return value
+
+
+class Results(object):
+    """Bounded in memory cache of SELECT results used by Query.cached().
+
+    Every entry remembers the generation of each table (tag) it was read from at the
+    time it was stored, invalidating a tag bumps its generation so every entry read
+    from that table is stale from then on without an index of keys per tag to keep
+    in step with LRU evictions. Any object with the same get, set and invalidate
+    methods, say a client for a local cache server, can be handed to
+    Supersql(result_cache=...) instead.
+    """
+    def __init__(self, maxsize: int = 256):
+        self._entries = LRU(maxsize)
+        self._generations: Dict[str, int] = {}
+        self.invalidations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self):
+        self._entries.clear()
+        self._generations.clear()
+
+    def get(self, key: Hashable) -> Any:
+        entry = self._entries.get(key)
+        if entry is None: return None
+        expires, tags, value = entry
+        generations = self._generations
+        if monotonic() >= expires or any(generations.get(tag, 0) != n for tag, n in tags):
+            self._entries.pop(key)
+            return None
+        return value
+
+    def info(self) -> Dict[str, int]:
+        return {**self._entries.info(), 'invalidations': self.invalidations}
+
+    def invalidate(self, *tags: str):
+        """Expire every entry read from any of the given tables"""
+        generations = self._generations
+        for tag in tags:
+            generations[tag] = generations.get(tag, 0) + 1
+        self.invalidations += 1
+
+    def set(self, key: Hashable, value: Any, ttl: float, tags: Iterable[str] = ()):
+        generations = self._generations
+        tags = tuple((tag, generations.get(tag, 0)) for tag in tags)
+        self._entries.put(key, (monotonic() + ttl, tags, value))
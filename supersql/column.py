@@ -39,6 +39,11 @@ SYM = '--?--'
 
 
 class Column():
+    """Column reference. Comparison operators and helpers never mutate the column,
+    they return a new Column expression carrying the SQL fragment and its argument,
+    which is what lets Table hand out the same Column instance on every access."""
+    __slots__ = ('_parameterize', '_name', '_table', '_sql', '_alias', '_arg')
+
     def __init__(self, col: str, table = None):
         self._parameterize = True
         self._name = col
@@ -47,52 +52,48 @@ class Column():
         self._alias = None
         self._arg = None
 
+    def _expression(self, sql = None, arg = None) -> 'Column':
+        this = Column.__new__(Column)
+        this._parameterize = self._parameterize
+        this._name = self._name
+        this._table = self._table
+        this._sql = sql
+        this._alias = self._alias
+        this._arg = arg
+        return this
+
     def __eq__(self, v: any) -> 'Column':
         if isinstance(v, Column):
             # if comparing column to column then return a string
             return f'{self} = {v}'
-        self._sql = f'{self} = {SYM}'
-        self._arg = v
-        return self
+        return self._expression(f'{self} = {SYM}', v)
 
     def __ge__(self, v: any) -> 'Column':
-        self._sql = f'{self} >= {SYM}'
-        self._arg = v
-        return self
+        return self._expression(f'{self} >= {SYM}', v)
 
     def __gt__(self, v: any) -> 'Column':
         return self.x('>', v)
 
     def __le__(self, v: any) -> 'Column':
-        self._sql = f'{self} <= {SYM}'
-        self._arg = v
-        return self
+        return self._expression(f'{self} <= {SYM}', v)
 
     def __lt__(self, v: any) -> 'Column':
-        self._sql = f'{self} < {SYM}'
-        self._arg = v
-        return self
+        return self._expression(f'{self} < {SYM}', v)
 
     def __mod__(self, v: any) -> 'Column':
-        self._sql = f'{self} LIKE {SYM}'
-        self._arg = f'%{v}%'
-        return self
-    
+        return self._expression(f'{self} LIKE {SYM}', f'%{v}%')
+
     def __mul__(self, v: any) -> 'Column':
         return self.x('*', v)
 
     def __ne__(self, v: any) -> 'Column':
-        self._sql = f'{self} <> {SYM}'
-        self._arg = v
-        return self
+        return self._expression(f'{self} <> {SYM}', v)
 
     def __neg__(self) -> 'Column':
-        self._sql = f'{self} DESC'
-        return self
+        return self._expression(f'{self} DESC')
 
     def __pos__(self) -> 'Column':
-        self._sql = f'{self} ASC'
-        return self
+        return self._expression(f'{self} ASC')
 
     def __str__(self) -> str:
         table_alias = self._table.__alias__ if self._table else None
@@ -110,8 +111,9 @@ class Column():
         self._parameterize = value
 
     def AS(self, alias: str):
-        self._alias = alias
-        return self
+        this = self._expression(self._sql, self._arg)
+        this._alias = alias
+        return this
 
     def LIKE(self, v, mask = '%%'):
         """
@@ -120,14 +122,12 @@ class Column():
         """
         if mask not in ['%%', '%-', '-%', '%_', '_%']:
             raise ValueError('invalid LIKE mask provided')
-        self._sql = f'{self._name} LIKE {SYM}'
         val = f'{v}'
         if mask.startswith('%'):
             val = f'%{val}'
         if mask.endswith('%'):
             val = f'{val}%'
-        self._arg = val
-        return self
+        return self._expression(f'{self._name} LIKE {SYM}', val)
 
     @staticmethod
     def COERCE(f: 'Column'):
@@ -141,8 +141,8 @@ class Column():
         return param
     
     def x(self, symbol, v: any) -> 'Column':
+        this = self._expression(None, v)
         def _():
-            return f'{self} {symbol} {SYM}' if self.parameterize else f'{self} {symbol} {v}'
-        self._sql = _
-        self._arg = v
-        return self
+            return f'{this} {symbol} {SYM}' if this.parameterize else f'{this} {symbol} {v}'
+        this._sql = _
+        return this
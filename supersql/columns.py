@@ -0,0 +1,61 @@
+from array import array
+from collections.abc import Mapping
+from typing import Any, Dict, List, Optional, Sequence
+
+
+# postgres type name -> (array.array typecode, numpy dtype)
+TYPES = {
+    'bool': ('b', 'bool'),
+    'int2': ('h', 'int16'),
+    'int4': ('i', 'int32'),
+    'int8': ('q', 'int64'),
+    'float4': ('f', 'float32'),
+    'float8': ('d', 'float64'),
+}
+
+# sqlite storage classes are the python types of the values themselves
+PYTHON = {bool: 'bool', int: 'int8', float: 'float8'}
+
+
+def infer(values: Sequence[Any]) -> Optional[str]:
+    for value in values:
+        if value is not None: return PYTHON.get(type(value))
+    return None
+
+
+def buffer(values: Sequence[Any], kind: Optional[str], numpy = None):
+    if kind not in TYPES: return list(values)
+    code, dtype = TYPES[kind]
+    try:
+        if numpy: return numpy.fromiter(values, dtype=dtype, count=len(values))
+        return array(code, values)
+    except (TypeError, ValueError, OverflowError):
+        # NULLs and out of range values can not live in a typed buffer
+        return list(values)
+
+
+def columns(records: Sequence[Any], names: List[str] = None, types: List[str] = None) -> Dict[str, Any]:
+    """Transpose driver records into one buffer per column without building
+    per row wrappers. Numeric columns become NumPy arrays when NumPy is installed
+    or array.array otherwise, everything else (and columns with NULLs) a list.
+
+    Parameters:
+        records: asyncpg.Record, aiosqlite.Row or dict (mysql) sequence
+        names: column names, read off the first record when not provided
+        types: postgres type names per column, inferred from the values when not provided
+    """
+    try: import numpy
+    except ImportError: numpy = None
+
+    if names is None:
+        names = list(records[0].keys()) if records else []
+    if not records: transposed = [() for _ in names]
+    # iterating a dict yields its keys, its values are read by name
+    elif isinstance(records[0], Mapping): transposed = [[record[name] for record in records] for name in names]
+    else: transposed = list(zip(*records))
+    if types is None:
+        types = [infer(values) for values in transposed]
+    return {
+        name: buffer(values, kind, numpy)
+        for name, values, kind in zip(names, transposed, types)
+    }
@@ -0,0 +1,41 @@
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .dialects import Dialect
+    from .query import SQLS
+
+
+class Compiler(object):
+    """Single pass SQL renderer. Clause nodes carry their operands and a shared render
+    function, the compiler walks them root first into one list of fragments and hands
+    out placeholders in the order they are written, so $n numbering is worked out while
+    rendering instead of being tracked by every builder call. Rendering never touches
+    the query or its operands."""
+    __slots__ = ('dialect', 'marker', 'numbered', 'position', 'rows')
+
+    def __init__(self, dialect: 'Dialect', rows: int = None):
+        self.dialect = dialect
+        self.marker = dialect.marker
+        self.numbered = dialect.numbered
+        self.position = 0
+        # multirow VALUES tuples rendered into this statement (one chunk)
+        self.rows = rows
+
+    def placeholder(self) -> str:
+        self.position += 1
+        return f'{self.marker}{self.position}' if self.numbered else self.marker
+
+    def placeholders(self, count: int) -> str:
+        start = self.position
+        self.position += count
+        if not self.numbered: return ', '.join([self.marker] * count)
+        marker = self.marker
+        return ', '.join([f'{marker}{n}' for n in range(start + 1, start + count + 1)])
+
+    def render(self, sqls: 'SQLS') -> str:
+        nodes = []
+        node = sqls._node
+        while node is not None:
+            nodes.append(node)
+            node = node.parent
+        return ' '.join([node.render(self, *node.operands) for node in reversed(nodes)])
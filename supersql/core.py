@@ -1,35 +1,311 @@
-from typing import List
+from asyncio import Semaphore, TimeoutError, gather
+from contextlib import asynccontextmanager
+from time import perf_counter
+from typing import Any, Dict, Iterable, List
 
-from .helpers import Connexer
+from .cache import LRU, Results
+from .constants import SQLITE
+from .dialects import DIALECTS, Dialect, dialect
+from .helpers import Bridge, Connexer, Connexes
+from .metrics import Instruments, PoolMetrics
+from .prepared import Prepared
 from .query import Query
+from .replicas import Replica, Replicas, disconnects
+from .schema import Database
+from .transaction import Transaction
 
 
 class Supersql(object):
-    def __init__(self, dsn: str):
+    def __init__(
+        self,
+        dsn: str,
+        cache_size: int = 256,
+        prepared_size: int = 128,
+        schema_ttl: float = 300.0,
+        schema_snapshot: str = None,
+        replicas: List[str] = None,
+        replica_cooldown: float = 30.0,
+        result_cache: Any = None,
+        slow_query: float = None,
+    ):
+        """replicas are DSNs of read replicas of dsn, SELECTs are spread over them while
+        everything else runs on dsn. A replica that can not be reached is left out for
+        replica_cooldown seconds. result_cache backs Query.cached(), an in memory
+        supersql.cache.Results unless another backend with its interface is given.
+        Executions taking slow_query seconds or longer are logged, see instruments"""
         self._dsn = dsn
-        self._vendor = None
+        self._dialect = None
         self._connexion = None
         self._pooled = False
+        self._pool = {}
+        self._pool_metrics = PoolMetrics()
+        self._acquire_timeout = None
+        self._pragmas = None
+        self._runner = None
+        self._statements = LRU(cache_size)
+        self._prepared = Prepared(prepared_size)
+        self._database = Database(self, schema_ttl, schema_snapshot)
+        self._replicas = Replicas(replicas, replica_cooldown)
+        self._results = Results() if result_cache is None else result_cache
+        self._cacheable = True
+        self._instruments = Instruments(slow_query)
 
-    async def connect(self, pooled = False):
-        self._pooled = pooled
-        vendor, connector = await Connexer(self._dsn, self._pooled)
+    async def connect(
+        self,
+        pooled = False,
+        min_size: int = None,
+        max_size: int = 10,
+        max_queries: int = 50000,
+        max_inactive_connection_lifetime: float = 300.0,
+        acquire_timeout: float = None,
+        pragmas: Dict[str, Any] = None,
+    ):
+        """Connect to the database. With pooled the min/max sizes, queries served per
+        connection before it is replaced and idle lifetime tune the pool, acquire_timeout
+        bounds how long a query waits for a free connection before TimeoutError. min_size
+        defaults to max_size.
+
+        Pooled sqlite opens max_size read only connections plus one writer, each with
+        WAL journaling and the other supersql.pool.PRAGMAS unless overridden in pragmas"""
+        self._configure(pooled, min_size, max_size, max_queries, max_inactive_connection_lifetime, acquire_timeout)
+        self._replicable()
+        dialect, connector = await Connexer(self._dsn, self._pooled, pragmas, **self._pool)
         self._connexion = connector
-        self._vendor = vendor
+        self._dialect = dialect
+        self._pragmas = pragmas
+        try:
+            for replica in self._replicas: await self._reach(replica)
+        except BaseException:
+            await self.disconnect()
+            raise
+
+    def _configure(self, pooled, min_size, max_size, max_queries, max_inactive_connection_lifetime, acquire_timeout):
+        if min_size is None: min_size = max_size
+        if min_size < 0 or max_size < 1 or min_size > max_size:
+            raise ValueError('Pool sizes must satisfy 0 <= min_size <= max_size and max_size >= 1')
+        self._pooled = pooled
+        self._acquire_timeout = acquire_timeout
+        self._pool = {
+            'min_size': min_size,
+            'max_size': max_size,
+            'max_queries': max_queries,
+            'max_inactive_connection_lifetime': max_inactive_connection_lifetime,
+        }
+
+    def _replicable(self):
+        primary = DIALECTS.get(self._dsn.partition('://')[0])
+        for replica in self._replicas:
+            if DIALECTS.get(replica.dsn.partition('://')[0]) is not primary:
+                raise ValueError('Replica DSNs must point at the same database engine as the primary')
+
+    def _wrote(self, tables: Iterable[str]):
+        """Drop the cached results of tables a statement just changed"""
+        self._results.invalidate(*tables)
+
+    async def _reach(self, replica: Replica):
+        """Connect a replica. One that can not be reached is ejected for replica_cooldown
+        instead of failing the engine and tried again by the first read after that"""
+        # claimed before connecting so concurrent reads do not open a second pool
+        replica.unreached = False
+        try:
+            if self._runner is not None and self.dialect.name == SQLITE:
+                _, replica.connexion, _ = Connexes(replica.dsn, False, self._pragmas)
+            # synchronous postgres runs this on the primary's bridge, one event loop thread serves every target
+            else: _, replica.connexion = await Connexer(replica.dsn, self._pooled, self._pragmas, **self._pool)
+        except disconnects():
+            replica.unreached = True
+            replica.eject(self._replicas.cooldown)
+
+    @asynccontextmanager
+    async def _acquire(self, write = False):
+        """Connection for one unit of work, reads are routed to a replica when there are
+        any. A replica that turns out to be unreachable is ejected for replica_cooldown"""
+        if not write:
+            for replica in self._replicas:
+                if replica.due: await self._reach(replica)
+        replica = None if write or not self._replicas else self._replicas.pick()
+        if replica is None:
+            async with self._checkout(self._connexion, write) as connection:
+                yield connection
+            return
+        replica.outstanding += 1
+        try:
+            async with self._checkout(replica.connexion, write) as connection:
+                yield connection
+        except TimeoutError:
+            # an exhausted pool or a slow statement is not an unreachable replica
+            raise
+        except disconnects():
+            replica.eject(self._replicas.cooldown)
+            raise
+        finally:
+            replica.outstanding -= 1
+
+    @asynccontextmanager
+    async def _checkout(self, connexion, write = False):
+        """Pooled engines check a connection out of the pool and record how long that
+        took. Pooled sqlite hands writes to its single writer"""
+        if not self._pooled:
+            yield connexion
+            return
+        metrics = self._pool_metrics
+        started = perf_counter()
+        try:
+            if self._vendor == SQLITE:
+                connection = await connexion.acquire(timeout=self._acquire_timeout, write=write)
+            else: connection = await connexion.acquire(timeout=self._acquire_timeout)
+        except TimeoutError:
+            metrics.timeouts += 1
+            raise
+        metrics.acquires += 1
+        metrics.wait.observe(perf_counter() - started)
+        try: yield connection
+        finally:
+            self._prepared.invalidate(connection)
+            await connexion.release(connection)
 
     async def disconnect(self):
         assert self._connexion
         connexion = self._connexion
         await connexion.close()
         self._connexion = None
+        for replica in self._replicas:
+            if replica.connexion is not None: await replica.connexion.close()
+            replica.connexion, replica.unreached = None, False
+        self._prepared.invalidate()
 
-    def connects(self):
-        """connect synchronous"""
-        raise NotImplementedError
+    def connects(
+        self,
+        pooled = False,
+        min_size: int = None,
+        max_size: int = 10,
+        max_queries: int = 50000,
+        max_inactive_connection_lifetime: float = 300.0,
+        acquire_timeout: float = None,
+        pragmas: Dict[str, Any] = None,
+    ):
+        """connect synchronous, sqlite uses the stdlib sqlite3 driver directly and postgres
+        runs asyncpg on a background event loop owned by this engine"""
+        self._configure(pooled, min_size, max_size, max_queries, max_inactive_connection_lifetime, acquire_timeout)
+        self._replicable()
+        dialect, connector, runner = Connexes(self._dsn, self._pooled, pragmas, **self._pool)
+        # a single sqlite3 connection serves synchronous sqlite, there is no thread to spread over
+        if dialect.name == SQLITE: self._pooled = False
+        self._connexion = connector
+        self._dialect = dialect
+        self._pragmas = pragmas
+        self._runner = runner
+        try:
+            for replica in self._replicas: runner(self._reach(replica))
+        except BaseException:
+            self.disconnects()
+            raise
 
     def disconnects(self):
         """disconnect synchronous"""
-        raise NotImplementedError
+        assert self._connexion and self._runner
+        runner = self._runner
+        runner(self._connexion.close())
+        for replica in self._replicas:
+            if replica.connexion is not None: runner(replica.connexion.close())
+            replica.connexion, replica.unreached = None, False
+        if isinstance(runner, Bridge): runner.stop()
+        self._connexion = None
+        self._runner = None
+        self._prepared.invalidate()
+
+    async def gather(self, *queries: Query, limit: int = None, Model = None, format: str = 'rows') -> List[Any]:
+        """Execute independent queries concurrently, each on its own pooled connection,
+        and return their results in the order given. At most limit queries (default the
+        pool max_size) hold a connection at once. A single connection can not overlap
+        round trips so unpooled engines run the batch one query after the other"""
+        if limit is not None and (not isinstance(limit, int) or limit < 1):
+            raise ValueError('gather limit must be a positive integer')
+        if not self._pooled:
+            return [await query.go(Model, format) for query in queries]
+        semaphore = Semaphore(limit or self._pool['max_size'])
+
+        async def going(query: Query):
+            async with semaphore:
+                return await query.go(Model, format)
+        return list(await gather(*[going(query) for query in queries]))
+
+    def gathers(self, *queries: Query, limit: int = None, Model = None, format: str = 'rows') -> List[Any]:
+        """Synchronous gather() for engines connected with Supersql.connects()"""
+        assert self._connexion and self._runner
+        return self._runner(self.gather(*queries, limit=limit, Model=Model, format=format))
+
+    async def ping(self) -> bool:
+        """Health check, round trips a trivial query through a (pooled) connection of the
+        primary. Replicas are checked too, ejecting unreachable ones and restoring the
+        ones that answer again"""
+        for replica in self._replicas:
+            if replica.due: await self._reach(replica)
+            if replica.connexion is None: continue
+            try:
+                async with self._checkout(replica.connexion) as conn:
+                    await conn.execute('SELECT 1')
+            except Exception: replica.eject(self._replicas.cooldown)
+            else: replica.restore()
+        try:
+            async with self._checkout(self._connexion) as conn:
+                await conn.execute('SELECT 1')
+        except Exception:
+            self._pool_metrics.failures += 1
+            return False
+        return True
+
+    @property
+    def database(self) -> Database:
+        """Reflected table metadata, cached for schema_ttl seconds"""
+        return self._database
+
+    @property
+    def dialect(self) -> Dialect:
+        """SQL dialect Connexer picked when the engine connected. Until then queries
+        render in the dialect the DSN names, or sqlite's when it names none"""
+        return self._dialect or DIALECTS.get((self._dsn or '').partition('://')[0], DIALECTS[SQLITE])
+
+    @property
+    def _vendor(self) -> str:
+        return self._dialect.name if self._dialect else None
+
+    @_vendor.setter
+    def _vendor(self, vendor: str):
+        self._dialect = None if vendor is None else dialect(vendor)
+
+    @property
+    def instruments(self) -> Instruments:
+        """Per statement timings and counters, pre/post execute hooks and slow query log"""
+        return self._instruments
+
+    @property
+    def pool_metrics(self) -> Dict[str, Any]:
+        """Snapshot of acquire wait histogram, timeouts and live in use / idle counts"""
+        pool = self._connexion if self._pooled else None
+        snapshot = self._pool_metrics.snapshot(pool)
+        if self._replicas: snapshot['replicas'] = self._replicas.snapshot()
+        return snapshot
+
+    @property
+    def prepared(self) -> Prepared:
+        """Server side prepared statements registry used for postgres SELECTs"""
+        return self._prepared
+
+    @property
+    def results(self) -> Results:
+        """SELECT result cache used by Query.cached()"""
+        return self._results
+
+    @property
+    def statements(self) -> LRU:
+        """Compiled SQL text cache keyed by query fingerprint, exposes hits and misses"""
+        return self._statements
+
+    def transaction(self, isolation: str = None, readonly: bool = False) -> Transaction:
+        """Pin one connection for a block of queries built off tx.query, committed with a
+        single COMMIT. Use async with, or plain with on engines from Supersql.connects()"""
+        return Transaction(self, isolation, readonly)
 
     @property
     def vendor(self) -> str:
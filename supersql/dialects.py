@@ -0,0 +1,132 @@
+from json import dumps
+from sqlite3 import sqlite_version_info
+from typing import TYPE_CHECKING, Any, List, Tuple
+
+from .constants import MYSQL, MYSQL_MAX_PARAMETERS, POSTGRES, POSTGRES_MAX_PARAMETERS, POSTGRESQL, SQLITE
+
+if TYPE_CHECKING: from .compiler import Compiler  # pragma: no cover
+
+
+class Dialect(object):
+    """What differs between database engines. The dialect is picked from the DSN scheme
+    once, when Supersql connects, clause renderers and the execution paths then read it
+    off the engine instead of comparing vendor names on every call."""
+    name: str = None
+    # $1, $2 ... when numbered, otherwise the same marker for every argument
+    marker = '?'
+    numbered = False
+    max_parameters = 999
+    # bulk loads stream over a native COPY protocol instead of multi row INSERTs
+    copy = False
+    # asyncpg shaped driver, statements go through the server side prepared statement
+    # cache (supersql.prepared) and transactions through connection.transaction()
+    prepared = False
+    # IN binds its options as one argument so the SQL text does not change with their number
+    arrays = True
+    isolation: Tuple[str, ...] = ()
+
+    def __repr__(self) -> str:
+        return f'<Dialect {self.name}>'
+
+    def begin(self, isolation: str = None, readonly: bool = False) -> List[str]:
+        """Statements opening a transaction on drivers without a transaction API"""
+        return ['BEGIN']
+
+    def bind(self, options: Tuple[Any, ...], jsonable: bool) -> List[Any]:
+        """Arguments an IN array is sent as, see contains()"""
+        return list(options)
+
+    def contains(self, c: 'Compiler', options: Tuple[Any, ...], jsonable: bool) -> str:
+        """IN test against an array argument. JSON-able arrays must render the same text
+        whatever their length, their length is not part of the query fingerprint"""
+        raise NotImplementedError  # pragma: no cover
+
+    def limit(self, value: int) -> str:
+        return f'LIMIT {value}'
+
+    def offset(self, value: int) -> str:
+        return f'OFFSET {value}'
+
+    def upsert(self, conflict: Tuple[str, ...], update: Tuple[str, ...]) -> str:
+        """Clause turning an INSERT into an update of the row it conflicts with"""
+        if not update: return f'''ON CONFLICT ({', '.join(conflict)}) DO NOTHING'''
+        updates = ', '.join(f'{column} = excluded.{column}' for column in update)
+        return f'''ON CONFLICT ({', '.join(conflict)}) DO UPDATE SET {updates}'''
+
+
+class Postgres(Dialect):
+    name = POSTGRES
+    marker = '$'
+    numbered = True
+    max_parameters = POSTGRES_MAX_PARAMETERS
+    copy = True
+    prepared = True
+    isolation = ('read_committed', 'read_uncommitted', 'repeatable_read', 'serializable')
+
+    def bind(self, options: Tuple[Any, ...], jsonable: bool) -> List[Any]:
+        return [list(options)]
+
+    def contains(self, c: 'Compiler', options: Tuple[Any, ...], jsonable: bool) -> str:
+        return f'= ANY({c.placeholder()})'
+
+
+class Sqlite(Dialect):
+    name = SQLITE
+    # SQLITE_MAX_VARIABLE_NUMBER default, raised from 999 in sqlite 3.32.0
+    max_parameters = 32766 if sqlite_version_info >= (3, 32, 0) else 999
+    isolation = ('deferred', 'immediate', 'exclusive')
+
+    def begin(self, isolation: str = None, readonly: bool = False) -> List[str]:
+        return [f'BEGIN {(isolation or "deferred").upper()}']
+
+    def bind(self, options: Tuple[Any, ...], jsonable: bool) -> List[Any]:
+        return [dumps(options)] if jsonable else list(options)
+
+    def contains(self, c: 'Compiler', options: Tuple[Any, ...], jsonable: bool) -> str:
+        # options with no JSON representation i.e. bytes or dates bind one ? each
+        if jsonable: return f'IN (SELECT value FROM json_each({c.placeholder()}))'
+        return f'IN ({c.placeholders(len(options))})'
+
+
+class MySQL(Dialect):
+    """MySQL 8 through aiomysql, which uses the format paramstyle"""
+    name = MYSQL
+    marker = '%s'
+    max_parameters = MYSQL_MAX_PARAMETERS
+    # aiomysql interpolates arguments client side so there is no server plan a fixed
+    # text would share, and a JSON array would keep IN off B-tree indexes and collations
+    arrays = False
+    isolation = ('read_committed', 'read_uncommitted', 'repeatable_read', 'serializable')
+
+    def begin(self, isolation: str = None, readonly: bool = False) -> List[str]:
+        statements = []
+        if isolation is not None:
+            statements.append(f'SET TRANSACTION ISOLATION LEVEL {isolation.replace("_", " ").upper()}')
+        statements.append('START TRANSACTION READ ONLY' if readonly else 'START TRANSACTION')
+        return statements
+
+    def contains(self, c: 'Compiler', options: Tuple[Any, ...], jsonable: bool) -> str:
+        if not options: return 'IN (NULL)'
+        return f'IN ({c.placeholders(len(options))})'
+
+    def upsert(self, conflict: Tuple[str, ...], update: Tuple[str, ...]) -> str:
+        # MySQL resolves the conflict on whichever unique key was hit, assigning a
+        # conflict column to itself is its spelling of DO NOTHING
+        if not update: return f'ON DUPLICATE KEY UPDATE {conflict[0]} = {conflict[0]}'
+        return f'''ON DUPLICATE KEY UPDATE {', '.join(f'{column} = VALUES({column})' for column in update)}'''
+
+
+_postgres = Postgres()
+DIALECTS = {
+    MYSQL: MySQL(),
+    POSTGRES: _postgres,
+    POSTGRESQL: _postgres,
+    SQLITE: Sqlite(),
+}
+
+
+def dialect(vendor: str) -> Dialect:
+    """Dialect of a vendor name or DSN scheme i.e. postgres, postgresql, sqlite, mysql"""
+    try: return DIALECTS[vendor]
+    except KeyError:
+        raise ValueError('Database string could not be used to determine a valid engine to connect to') from None
@@ -1,17 +1,102 @@
-from .constants import POSTGRES, POSTGRESQL, SQLITE
+from asyncio import new_event_loop, run_coroutine_threadsafe
+from threading import Thread
+from typing import Any, Dict
 
+from .constants import MYSQL, POSTGRES, SQLITE
+from .dialects import dialect
+from .pool import LitePool, Pragmatic, pragmatic
 
-async def Connexer(dsn: str, pooled = False):
+
+async def Connexer(dsn: str, pooled = False, pragmas: Dict[str, Any] = None, **pool):
+    """Connect (or open a pool) to dsn, returns the Dialect of the engine alongside it"""
     if not dsn: raise ValueError('DSN connection string is required to connect to database')
     vendor, _, remainder = dsn.partition('://')
-    if vendor in [POSTGRES, POSTGRESQL]:
+    engine = dialect(vendor)
+    if engine.name == POSTGRES:
         from asyncpg import connect, create_pool
         if not pooled:
-            return vendor, await connect(dsn=dsn)
-        return vendor, await create_pool(dsn)
-    elif vendor == SQLITE:
-        from aiosqlite import connect, Row
-        connection = await connect(remainder)
-        connection.row_factory = Row
-        return vendor, connection
-    raise ValueError('Database string could not be used to determine a valid engine to connect to')
+            return engine, await connect(dsn=dsn)
+        return engine, await create_pool(dsn, **pool)
+    elif engine.name == MYSQL:
+        from .mysql import connect, create_pool
+        if not pooled:
+            return engine, await connect(dsn)
+        return engine, await create_pool(dsn, **pool)
+    if not pooled:
+        return engine, await Pragmatic(remainder, pragmas)
+    return engine, await LitePool(remainder, pool.get('max_size', 4), pragmas).open()
+
+
+def Connexes(dsn: str, pooled = False, pragmas: Dict[str, Any] = None, **pool):
+    """Synchronous Connexer, also returns the runner used to execute Query.go() coroutines"""
+    if not dsn: raise ValueError('DSN connection string is required to connect to database')
+    vendor, _, remainder = dsn.partition('://')
+    engine = dialect(vendor)
+    if engine.name != SQLITE:
+        bridge = Bridge()
+        try: _, connection = bridge(Connexer(dsn, pooled, **pool))
+        except BaseException:
+            bridge.stop()
+            raise
+        return engine, connection, bridge
+    from sqlite3 import connect, Row
+    statements = pragmatic(pragmas)
+    connection = connect(remainder)
+    connection.row_factory = Row
+    for statement in statements:
+        connection.execute(statement)
+    return engine, Synchronous(connection), drive
+
+
+def drive(coroutine):
+    """Run a coroutine that never suspends to completion without an event loop"""
+    try: coroutine.send(None)
+    except StopIteration as stop: return stop.value
+    coroutine.close()
+    raise RuntimeError('Synchronous engine coroutine suspended on real I/O')
+
+
+class Bridge(object):
+    """Event loop living on a daemon thread for the lifetime of a synchronous postgres
+    engine so each Query.run() costs a thread hop instead of an event loop startup"""
+    def __init__(self):
+        self._loop = new_event_loop()
+        self._thread = Thread(target=self._loop.run_forever, name='supersql-bridge', daemon=True)
+        self._thread.start()
+
+    def __call__(self, coroutine):
+        return run_coroutine_threadsafe(coroutine, self._loop).result()
+
+    def stop(self):
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+
+class Synchronous(object):
+    """aiosqlite shaped facade over a stdlib sqlite3 connection. None of its coroutines
+    ever suspend, so Query.go() driven by drive() runs at native sqlite3 speed"""
+    def __init__(self, connection):
+        self._connection = connection
+
+    @property
+    def in_transaction(self) -> bool:
+        return self._connection.in_transaction
+
+    async def close(self):
+        self._connection.close()
+
+    async def commit(self):
+        self._connection.commit()
+
+    async def execute(self, sql: str, parameters = ()):
+        return self._connection.execute(sql, parameters)
+
+    async def execute_fetchall(self, sql: str, parameters = ()):
+        return self._connection.execute(sql, parameters).fetchall()
+
+    async def executemany(self, sql: str, parameters):
+        return self._connection.executemany(sql, parameters)
+
+    async def rollback(self):
+        self._connection.rollback()
@@ -0,0 +1,84 @@
+from inspect import Parameter, signature
+from operator import itemgetter
+from typing import Any, Callable, Tuple
+
+from .cache import LRU
+
+
+# (Model, column layout, record kind, validate) -> record to Model constructor
+CONSTRUCTORS = LRU(512)
+
+POSITIONAL = (Parameter.POSITIONAL_ONLY, Parameter.POSITIONAL_OR_KEYWORD)
+
+
+def _getter(fields: Tuple[Any, ...]) -> Callable[[Any], tuple]:
+    getter = itemgetter(*fields)
+    if len(fields) == 1: return lambda record: (getter(record),)
+    return getter
+
+
+def _pydantic(Model) -> bool:
+    return hasattr(Model, 'model_fields') or hasattr(Model, '__fields__')
+
+
+def _parameters(Model):
+    try: parameters = list(signature(Model).parameters.values())
+    except (TypeError, ValueError): return None
+    if all(parameter.kind in POSITIONAL for parameter in parameters): return [p.name for p in parameters]
+    return None
+
+
+def _pydantic_constructor(Model, keys: Tuple[str, ...], values, validate: bool):
+    validator = getattr(Model, '__pydantic_validator__', None)
+    if validate:
+        # pydantic v2 validates the dict directly, skipping the keyword argument call
+        if validator is not None: validate_python = validator.validate_python
+        else: validate_python = lambda data: Model(**data)
+        return lambda record: validate_python(dict(zip(keys, values(record))))
+    # model_construct fills in defaults and runs model_post_init without validating
+    construct = getattr(Model, 'model_construct', None) or getattr(Model, 'construct')
+    return lambda record: construct(**dict(zip(keys, values(record))))
+
+
+def compile(Model, keys: Tuple[str, ...], mapping: bool, validate: bool = True) -> Callable[[Any], Any]:
+    """Specialised constructor turning one record of the given column layout into a Model.
+
+    Parameters:
+        Model: class (or any callable) the rows are hydrated into
+        keys: column names of the records in result order
+        mapping: records are dicts, values are then looked up by name instead of position
+        validate: pydantic models are validated, when False they are built with
+            model_construct (construct on pydantic v1) which trusts the database
+    """
+    def fields(names):
+        return tuple(names) if mapping else tuple(keys.index(name) for name in names)
+    values = _getter(fields(keys))
+
+    if _pydantic(Model):
+        return _pydantic_constructor(Model, keys, values, validate)
+
+    if isinstance(Model, type) and issubclass(Model, tuple) and set(getattr(Model, '_fields', ())) == set(keys):
+        # namedtuple, its fields are exactly its positional arguments
+        new = tuple.__new__
+        if not mapping and Model._fields == keys: return lambda record: new(Model, record)
+        ordered = _getter(fields(Model._fields))
+        return lambda record: new(Model, ordered(record))
+
+    # dataclasses, __slots__ classes and any other class whose positional parameters
+    # are exactly the selected columns are called positionally, skipping kwargs parsing
+    parameters = _parameters(Model)
+    if parameters is not None and len(parameters) == len(keys) and set(parameters) == set(keys):
+        ordered = _getter(fields(parameters))
+        return lambda record: Model(*ordered(record))
+    return lambda record: Model(**dict(zip(keys, values(record))))
+
+
+def hydrator(Model, record: Any, validate: bool = True) -> Callable[[Any], Any]:
+    """Cached constructor for the column layout of record, shared by every query
+    returning the same columns into the same Model"""
+    keys = tuple(record.keys())
+    mapping = isinstance(record, dict)
+    key = (Model, keys, mapping, validate)
+    make = CONSTRUCTORS.peek(key)
+    if make is None: make = CONSTRUCTORS.put(key, compile(Model, keys, mapping, validate))
+    return make
@@ -0,0 +1,189 @@
+from bisect import bisect_left
+from logging import getLogger
+from math import inf
+from time import perf_counter
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .cache import LRU
+
+
+logger = getLogger('supersql')
+
+
+# upper bounds in seconds
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, inf)
+
+
+class Histogram(object):
+    """Fixed bucket latency histogram, cheap enough to observe on every call"""
+    __slots__ = ('_buckets', '_counts', 'count', 'total', 'max')
+
+    def __init__(self, buckets: Tuple[float] = BUCKETS):
+        self._buckets = buckets
+        self._counts = [0] * len(buckets)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        self.count += 1
+        self.total += value
+        if value > self.max: self.max = value
+        self._counts[bisect_left(self._buckets, value)] += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            'count': self.count,
+            'total': self.total,
+            'mean': self.total / self.count if self.count else 0.0,
+            'max': self.max,
+            'buckets': dict(zip(self._buckets, self._counts)),
+        }
+
+
+class PoolMetrics(object):
+    """Acquire wait times, timeouts and failed health checks of a connection pool"""
+    def __init__(self):
+        self.acquires = 0
+        self.timeouts = 0
+        self.failures = 0
+        self.wait = Histogram()
+
+    def snapshot(self, pool = None) -> Dict[str, Any]:
+        snapshot = {
+            'acquires': self.acquires,
+            'timeouts': self.timeouts,
+            'failures': self.failures,
+            'wait': self.wait.snapshot(),
+        }
+        if pool is not None:
+            size, idle = pool.get_size(), pool.get_idle_size()
+            snapshot.update(
+                size=size,
+                idle=idle,
+                in_use=size - idle,
+                min_size=pool.get_min_size(),
+                max_size=pool.get_max_size(),
+            )
+        return snapshot
+
+
+class Execution(object):
+    """Timings of one query execution handed to the before and after hooks. Phases are
+    measured back to back with lap() so they add up to total"""
+    __slots__ = ('sql', 'args', 'compile', 'acquire', 'execute', 'decode', 'rows', 'error', '_started', '_last')
+
+    def __init__(self, sql: str, args: List[Any], compile: float = 0.0):
+        self.sql = sql
+        self.args = args
+        self.compile = compile
+        self.acquire = 0.0
+        self.execute = 0.0
+        self.decode = 0.0
+        self.rows = None
+        self.error = None
+        self._started = self._last = perf_counter()
+
+    @property
+    def total(self) -> float:
+        return self.compile + self.acquire + self.execute + self.decode
+
+    def lap(self) -> float:
+        now = perf_counter()
+        elapsed, self._last = now - self._last, now
+        return elapsed
+
+
+class QueryStats(object):
+    """Counters and phase histograms of every execution of one SQL statement"""
+    __slots__ = ('count', 'errors', 'slow', 'rows', 'compile', 'acquire', 'execute', 'decode', 'total')
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.slow = 0
+        self.rows = 0
+        self.compile = Histogram()
+        self.acquire = Histogram()
+        self.execute = Histogram()
+        self.decode = Histogram()
+        self.total = Histogram()
+
+    def observe(self, execution: Execution, slow: bool):
+        self.count += 1
+        if execution.error is not None: self.errors += 1
+        if slow: self.slow += 1
+        self.rows += execution.rows or 0
+        self.compile.observe(execution.compile)
+        self.acquire.observe(execution.acquire)
+        self.execute.observe(execution.execute)
+        self.decode.observe(execution.decode)
+        self.total.observe(execution.total)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            'count': self.count,
+            'errors': self.errors,
+            'slow': self.slow,
+            'rows': self.rows,
+            'compile': self.compile.snapshot(),
+            'acquire': self.acquire.snapshot(),
+            'execute': self.execute.snapshot(),
+            'decode': self.decode.snapshot(),
+            'total': self.total.snapshot(),
+        }
+
+
+class Instruments(object):
+    """Per statement execution metrics plus pre and post execute hooks.
+
+    Statistics are kept per compiled SQL text, which is one to one with the query
+    fingerprint, for the maxsize most recently executed statements. Executions slower
+    than slow seconds are logged on the 'supersql' logger. Hooks are called with the
+    Execution, a hook that raises is logged and never fails the query.
+    """
+    def __init__(self, slow: Optional[float] = None, maxsize: int = 1024):
+        self.slow = slow
+        self._stats = LRU(maxsize)
+        self._before: List[Callable[[Execution], Any]] = []
+        self._after: List[Callable[[Execution], Any]] = []
+
+    def after(self, hook: Callable[[Execution], Any]) -> Callable[[Execution], Any]:
+        """Register a hook called once the query finished or failed, usable as a decorator"""
+        self._after.append(hook)
+        return hook
+
+    def before(self, hook: Callable[[Execution], Any]) -> Callable[[Execution], Any]:
+        """Register a hook called right before a connection is acquired for the query"""
+        self._before.append(hook)
+        return hook
+
+    def _call(self, hooks: List[Callable[[Execution], Any]], execution: Execution):
+        for hook in hooks:
+            try: hook(execution)
+            except Exception: logger.exception('supersql instrumentation hook %r failed', hook)
+
+    def start(self, sql: str, args: List[Any], compile: float = 0.0) -> Execution:
+        execution = Execution(sql, args, compile)
+        if self._before: self._call(self._before, execution)
+        return execution
+
+    def finish(self, execution: Execution, results: Any = None, error: BaseException = None):
+        if not execution.execute: execution.execute = execution.lap()
+        if execution.rows is None:
+            if isinstance(results, int): execution.rows = results
+            elif hasattr(results, '__len__'): execution.rows = len(results)
+        execution.error = error
+        slow = self.slow is not None and execution.total >= self.slow
+        if slow: logger.warning('supersql slow query took %.6fs: %s', execution.total, execution.sql)
+        stats = self._stats.get(execution.sql)
+        if stats is None: stats = self._stats.put(execution.sql, QueryStats())
+        stats.observe(execution, slow)
+        if self._after: self._call(self._after, execution)
+
+    def reset(self):
+        self._stats.clear()
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """SQL text to its counters and compile, acquire, execute, decode and total histograms"""
+        return {sql: stats.snapshot() for sql, stats in self._stats._data.items()}
@@ -0,0 +1,128 @@
+from asyncio import wait_for
+from typing import Any, Dict
+from urllib.parse import unquote, urlsplit
+
+
+def _options(dsn: str) -> Dict[str, Any]:
+    parts = urlsplit(dsn)
+    return {
+        'host': parts.hostname or 'localhost',
+        'port': parts.port or 3306,
+        'user': unquote(parts.username or ''),
+        'password': unquote(parts.password or ''),
+        'db': parts.path.lstrip('/') or None,
+        # statements commit on their own unless a transaction was begun explicitly,
+        # the same contract as asyncpg and aiosqlite with isolation_level None
+        'autocommit': True,
+    }
+
+
+async def connect(dsn: str) -> 'Connection':
+    from aiomysql import connect
+    return Connection(await connect(**_options(dsn)))
+
+
+async def create_pool(dsn: str, min_size: int = 10, max_size: int = 10,
+                      max_inactive_connection_lifetime: float = 300.0, **pool) -> 'Pool':
+    """aiomysql pool, max_queries has no aiomysql counterpart and is ignored.
+    aiomysql can not retire idle connections, max_inactive_connection_lifetime becomes
+    its pool_recycle which replaces connections that old whether or not they are busy"""
+    from aiomysql import create_pool
+    return Pool(await create_pool(
+        minsize=min_size, maxsize=max_size, pool_recycle=max_inactive_connection_lifetime, **_options(dsn)
+    ))
+
+
+class Executing(object):
+    """What Connection.execute() returns, like aiosqlite awaiting it runs the statement
+    on a buffered cursor while async with streams the rows through an unbuffered one"""
+    def __init__(self, connection, sql: str, parameters):
+        self._connection = connection
+        self._sql = sql
+        self._parameters = parameters or None
+        self._cursor = None
+
+    def __await__(self):
+        return self._execute().__await__()
+
+    async def _execute(self):
+        from aiomysql import DictCursor
+        cursor = await self._connection.cursor(DictCursor)
+        await cursor.execute(self._sql, self._parameters)
+        # BEGIN, SAVEPOINT and other statements without a result set leave nothing to fetch
+        if cursor.description is None: await cursor.close()
+        return cursor
+
+    async def __aenter__(self):
+        from aiomysql import SSDictCursor
+        self._cursor = await self._connection.cursor(SSDictCursor)
+        await self._cursor.execute(self._sql, self._parameters)
+        return self._cursor
+
+    async def __aexit__(self, kind, error, traceback):
+        cursor, self._cursor = self._cursor, None
+        await cursor.close()
+        return False
+
+
+class Connection(object):
+    """aiosqlite shaped facade over an aiomysql connection so mysql shares the sqlite
+    execution paths, records come back as dicts"""
+    def __init__(self, connection):
+        self._connection = connection
+
+    @property
+    def in_transaction(self) -> bool:
+        return self._connection.get_transaction_status()
+
+    async def close(self):
+        await self._connection.ensure_closed()
+
+    async def commit(self):
+        await self._connection.commit()
+
+    def execute(self, sql: str, parameters = ()) -> Executing:
+        return Executing(self._connection, sql, parameters)
+
+    async def execute_fetchall(self, sql: str, parameters = ()):
+        from aiomysql import DictCursor
+        async with self._connection.cursor(DictCursor) as cursor:
+            await cursor.execute(sql, parameters or None)
+            return await cursor.fetchall()
+
+    async def executemany(self, sql: str, parameters):
+        # aiomysql rewrites INSERT ... VALUES executemany into multi row statements
+        async with self._connection.cursor() as cursor:
+            await cursor.executemany(sql, parameters)
+
+    async def rollback(self):
+        await self._connection.rollback()
+
+
+class Pool(object):
+    """aiomysql pool with the acquire(timeout)/release and size accessors of an asyncpg
+    pool, connections are handed out wrapped in Connection"""
+    def __init__(self, pool):
+        self._pool = pool
+
+    async def acquire(self, timeout: float = None) -> Connection:
+        return Connection(await wait_for(self._pool.acquire(), timeout))
+
+    async def release(self, connection: Connection):
+        await self._pool.release(connection._connection)
+
+    async def close(self):
+        self._pool.close()
+        await self._pool.wait_closed()
+
+    def get_idle_size(self) -> int:
+        return self._pool.freesize
+
+    def get_max_size(self) -> int:
+        return self._pool.maxsize
+
+    def get_min_size(self) -> int:
+        return self._pool.minsize
+
+    def get_size(self) -> int:
+        return self._pool.size
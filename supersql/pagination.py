@@ -0,0 +1,47 @@
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from binascii import Error as Base64Error
+from datetime import date, datetime, time
+from decimal import Decimal
+from json import dumps, loads
+from typing import Any, List
+from uuid import UUID
+
+
+# keyset values json can not carry natively, tagged so they decode back to the same type
+TAGS = {
+    '$datetime': (datetime, datetime.isoformat, datetime.fromisoformat),
+    '$date': (date, date.isoformat, date.fromisoformat),
+    '$time': (time, time.isoformat, time.fromisoformat),
+    '$decimal': (Decimal, str, Decimal),
+    '$uuid': (UUID, str, UUID),
+    '$bytes': (bytes, bytes.hex, bytes.fromhex),
+}
+
+
+def _tag(value: Any) -> Any:
+    # datetime before date, a datetime is a date as well
+    for tag, (kind, dump, _) in TAGS.items():
+        if isinstance(value, kind): return {tag: dump(value)}
+    if value is None or isinstance(value, (bool, int, float, str)): return value
+    raise ValueError(f'PAGINATE can not carry {type(value).__name__} values in a continuation token')
+
+
+def _untag(value: Any) -> Any:
+    if isinstance(value, dict) and len(value) == 1:
+        tag, dumped = next(iter(value.items()))
+        if tag in TAGS: return TAGS[tag][2](dumped)
+    return value
+
+
+def tokenize(values: List[Any]) -> str:
+    """Opaque, url safe continuation token carrying the keyset of the last row of a page"""
+    return urlsafe_b64encode(dumps([_tag(value) for value in values], separators=(',', ':')).encode()).decode()
+
+
+def detokenize(token: str, count: int) -> List[Any]:
+    try: values = loads(urlsafe_b64decode(token.encode()))
+    except (Base64Error, UnicodeError, ValueError, AttributeError):
+        raise ValueError('Invalid PAGINATE continuation token') from None
+    if not isinstance(values, list) or len(values) != count:
+        raise ValueError('PAGINATE continuation token does not match the order columns')
+    return [_untag(value) for value in values]
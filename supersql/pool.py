@@ -0,0 +1,89 @@
+from asyncio import Lock, Queue, wait_for
+from typing import Any, Dict, List
+
+
+# applied to every pooled sqlite connection unless overridden
+PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'mmap_size': 268435456,
+    'cache_size': -64000,
+}
+
+
+def pragmatic(pragmas: Dict[str, Any] = None) -> List[str]:
+    """PRAGMA statements setting pragmas, names and values are written into the SQL
+    so anything but identifiers and plain (negative) numbers or words is refused"""
+    statements = []
+    for pragma, value in (pragmas or {}).items():
+        if not pragma.isidentifier() or not str(value).replace('-', '').isalnum():
+            raise ValueError(f'Invalid sqlite PRAGMA {pragma} = {value}')
+        statements.append(f'PRAGMA {pragma} = {value}')
+    return statements
+
+
+async def Pragmatic(database: str, pragmas: Dict[str, Any] = None):
+    """Open an aiosqlite connection and apply pragmas to it"""
+    from aiosqlite import connect, Row
+    statements = pragmatic(pragmas)
+    connection = await connect(database)
+    connection.row_factory = Row
+    for statement in statements:
+        await connection.execute(statement)
+    return connection
+
+
+class LitePool(object):
+    """Pool of aiosqlite connections to one database file. Each aiosqlite connection
+    runs on its own thread, so SELECTs spread across `readers` read only connections
+    while every write is serialised through the single writer connection, which is
+    what sqlite allows anyway."""
+    def __init__(self, database: str, readers: int = 4, pragmas: Dict[str, Any] = None):
+        if not database or database == ':memory:':
+            raise ValueError('Pooled sqlite needs a database file, in memory databases are per connection')
+        if readers < 1:
+            raise ValueError('Pooled sqlite needs at least one reader connection')
+        self._database = database
+        self._pragmas = {**PRAGMAS, **(pragmas or {})}
+        self._size = readers
+        self._readers = Queue()
+        self._connections = []
+        self._writer = None
+        self._lock = Lock()
+
+    async def open(self) -> 'LitePool':
+        self._writer = await Pragmatic(self._database, self._pragmas)
+        for _ in range(self._size):
+            reader = await Pragmatic(self._database, {**self._pragmas, 'query_only': 1})
+            self._connections.append(reader)
+            self._readers.put_nowait(reader)
+        return self
+
+    async def acquire(self, timeout: float = None, write = False):
+        if write:
+            await wait_for(self._lock.acquire(), timeout)
+            return self._writer
+        return await wait_for(self._readers.get(), timeout)
+
+    async def release(self, connection):
+        if connection is self._writer: self._lock.release()
+        else: self._readers.put_nowait(connection)
+
+    async def close(self):
+        connections, self._connections = self._connections, []
+        for reader in connections: await reader.close()
+        if self._writer is not None:
+            await self._writer.close()
+            self._writer = None
+
+    def get_idle_size(self) -> int:
+        return self._readers.qsize() + (0 if self._lock.locked() else 1)
+
+    def get_max_size(self) -> int:
+        return self._size + 1
+
+    def get_min_size(self) -> int:
+        return self._size + 1
+
+    def get_size(self) -> int:
+        return self._size + 1
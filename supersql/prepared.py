@@ -0,0 +1,63 @@
+from typing import Any, List, Optional, Tuple
+
+from .cache import LRU
+
+
+class Prepared(object):
+    """Registry of server side prepared statements kept per asyncpg connection.
+
+    Every compiled query is prepared once per connection with the public prepare()
+    and reused on subsequent calls. asyncpg refuses statements of a pooled connection
+    once it was released, Supersql forgets them when the connection goes back to the
+    pool so they are prepared again on the next acquire. Statements are evicted least
+    recently used first once `size` is reached and dropped entirely when the server
+    reports the schema changed underneath them.
+    """
+    def __init__(self, size: int = 128):
+        self._size = size
+        # pool proxies can not be weakly referenced, entries are popped on release
+        self._registry = {}
+        self.prepares = 0
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def _statements(self, conn) -> LRU:
+        statements = self._registry.get(conn)
+        if statements is None:
+            statements = self._registry[conn] = LRU(self._size)
+        return statements
+
+    def describe(self, conn, sql: str) -> Tuple[Optional[List[str]], Optional[List[str]]]:
+        """Column names and postgres type names of an already registered statement"""
+        statements = self._registry.get(conn)
+        statement = statements.peek(sql) if statements is not None else None
+        if statement is None: return None, None
+        attributes = statement.get_attributes()
+        return [a.name for a in attributes], [a.type.name for a in attributes]
+
+    def invalidate(self, conn = None):
+        """Forget prepared statements for one connection or every connection"""
+        if conn is None: self._registry.clear()
+        else: self._registry.pop(conn, None)
+
+    async def prepare(self, conn, sql: str):
+        statements = self._statements(conn)
+        statement = statements.get(sql)
+        if statement is None:
+            self.prepares += 1
+            statement = statements.put(sql, await conn.prepare(sql))
+        return statement
+
+    async def fetch(self, conn, sql: str, args: List[Any]):
+        if not self._size: return await conn.fetch(sql, *args)
+        from asyncpg.exceptions import InvalidCachedStatementError, OutdatedSchemaCacheError
+
+        statement = await self.prepare(conn, sql)
+        try: return await statement.fetch(*args)
+        except (InvalidCachedStatementError, OutdatedSchemaCacheError):
+            # a schema change invalidates plans on every connection not just this one
+            self.invalidate()
+            statement = await self.prepare(conn, sql)
+            return await statement.fetch(*args)
@@ -2,14 +2,21 @@
 """
 from enum import Enum
 import re
-from typing import TYPE_CHECKING, Any, Iterable, List, Tuple, TypeVar
+from contextlib import asynccontextmanager, nullcontext
+from time import perf_counter
+from typing import TYPE_CHECKING, Any, AsyncIterator, Hashable, Iterable, List, Tuple, TypeVar
 
 from inflection import tableize
 
-from .column import Column
+from .column import SYM, Column
+from .columns import columns
+from .compiler import Compiler
 from .constants import *
-from .results import Rows
+from .dialects import Dialect
+from .pagination import detokenize, tokenize
+from .results import Page, Rows
 from .table import Table
+from .template import Param
 
 if TYPE_CHECKING: from supersql import Supersql  # pragma: no cover
 
@@ -17,87 +24,309 @@ if TYPE_CHECKING: from supersql import Supersql  # pragma: no cover
 T = TypeVar('T')
 
 
+async def chunked(records, size: int) -> AsyncIterator[list]:
+    """Group an iterable or async iterable into lists of at most size items"""
+    chunk = []
+    if hasattr(records, '__aiter__'):
+        async for record in records:
+            chunk.append(record)
+            if len(chunk) == size:
+                yield chunk
+                chunk = []
+    else:
+        for record in records:
+            chunk.append(record)
+            if len(chunk) == size:
+                yield chunk
+                chunk = []
+    if chunk: yield chunk
+
+
+@asynccontextmanager
+async def atomic(conn, prepared: bool):
+    """Run the block in a transaction unless the connection is already inside one,
+    prepared (asyncpg shaped) connections nest transactions on their own"""
+    if prepared:
+        async with conn.transaction(): yield conn
+        return
+    owner = not conn.in_transaction
+    if owner: await conn.execute('BEGIN')
+    try: yield conn
+    except BaseException:
+        if owner: await conn.rollback()
+        raise
+    if owner: await conn.commit()
+
+
+def identify(operand: Any) -> Hashable:
+    """Structural identity of a clause operand i.e. everything that ends up in the
+    rendered SQL text but none of the bound argument values"""
+    if isinstance(operand, str):
+        return operand
+    if isinstance(operand, Column):
+        sql = operand._sql() if callable(operand._sql) else operand._sql
+        return (Column, operand._name, identify(operand._table), operand._alias, sql)
+    if isinstance(operand, Table):
+        return (Table, operand.__tn__, operand.__alias__)
+    if isinstance(operand, SQLS):
+        return tuple(operand._keys)
+    return (type(operand), operand)
+
+
+class Clause(object):
+    """Persistent, singly linked clause node. Every builder method links one new node
+    onto its parent so queries sharing a prefix share the nodes of that prefix. Nodes
+    hold no SQL, render(compiler, *operands) writes their text (see supersql.compiler)"""
+    __slots__ = ('parent', 'key', 'render', 'operands', 'args')
+
+    def __init__(self, parent: 'Clause', key: Hashable, render, operands: tuple = (), args: tuple = ()):
+        self.parent = parent
+        self.key = key
+        self.render = render
+        self.operands = operands
+        self.args = args
+
+
 class SQLS(object):
+    __slots__ = ('_node',)
+
     def __init__(self) -> None:
-        self._args = []
-        self._sql = []
+        self._node = None
 
     def __str__(self) -> str:
-        sql = ' '.join(s() for s in self._sql)
-        return sql
+        return Compiler(self._engine.dialect).render(self)
+
+    def _derive(self) -> 'SQLS':
+        raise NotImplementedError  # pragma: no cover
+
+    def _nodes(self) -> List[Clause]:
+        nodes = []
+        node = self._node
+        while node is not None:
+            nodes.append(node)
+            node = node.parent
+        nodes.reverse()
+        return nodes
+
+    def _push(self, key: Hashable, render, operands: tuple = (), args: tuple = (), **state) -> 'SQLS':
+        this = self._derive()
+        this._node = Clause(self._node, key, render, operands, args)
+        for attribute, value in state.items():
+            setattr(this, attribute, value)
+        return this
+
+    @property
+    def _args(self) -> List[Any]:
+        return [arg for node in self._nodes() for arg in node.args]
+
+    @property
+    def _keys(self) -> Tuple[Hashable]:
+        return tuple(node.key for node in self._nodes())
 
     def sql(self, unsafe = False) -> str:
-        vendor = self._engine.vendor
-        sql = str(self._clone())
+        dialect = self._engine.dialect
+        sql = str(self)
         if unsafe:
-            if vendor != POSTGRES:
-                for arg in self._args:
-                    sql = sql.replace('?', arg, 1)
-            else:
-                for pos, arg in enumerate(self._args):
-                    sql = sql.replace(f'${pos + 1}', arg, 1)
+            for pos, arg in enumerate(self._args):
+                placeholder = f'{dialect.marker}{pos + 1}' if dialect.numbered else dialect.marker
+                sql = sql.replace(placeholder, str(arg), 1)
         return sql
 
 
 class CaseExpression(SQLS):
+    __slots__ = ('query', 'parameterize')
+
     def __init__(self, query, parameterize) -> None:
         super().__init__()
         self.query = query
         self.parameterize = parameterize
-        self._sql = [lambda: 'CASE']
+        self._node = Clause(None, CASE, _words, (CASE,))
+
+    @property
+    def _engine(self) -> 'Supersql':
+        return self.query._engine
+
+    def _derive(self) -> 'CaseExpression':
+        this = CaseExpression.__new__(CaseExpression)
+        this.query = self.query
+        this.parameterize = self.parameterize
+        this._node = self._node
+        return this
 
     def _conditional(self, condition: Column, param: any, command: str):
-        def _():
-            if not isinstance(condition, Column):
-                sql = f'{command} {Column.QUOTE(condition)}'
-            else:
-                condition.parameterize = False
-                _sql = condition._sql() if callable(condition._sql) else condition._sql
-                sql = f'''{command} {_sql}'''
-            return sql
-        self._sql.append(_)
-        return self
+        key = (command, identify(condition), condition._arg if isinstance(condition, Column) else None)
+        return self._push(key, _inlined, (command, condition))
 
     def AS(self, alias: str) -> 'Query':
-        self._sql.append(lambda: f'AS {alias}')
-        return self
+        return self._push((AS, alias), _words, (AS, alias))
 
     def ELSE(self, value: any) -> 'CaseExpression':
-        self._sql.append(lambda: f'ELSE {Column.QUOTE(value)}')
-        return self
+        return self._push((ELSE, identify(value)), _words, (ELSE, Column.QUOTE(value)))
 
     @property
     def END(self) -> 'CaseExpression':
-        self._sql.append(lambda: 'END')
-        return self
+        return self._push(END, _words, (END,))
 
     def THEN(self, condition: any, param = None) -> 'CaseExpression':
         if isinstance(condition, Column) and condition._sql is None:
-            self._sql.append(lambda: f'''THEN {condition}''')
-            return self
+            return self._push((THEN, identify(condition)), _words, (THEN, condition))
         return self._conditional(condition, param, THEN)
 
     def WHEN(self, condition: Column, param = None) -> 'CaseExpression':
         if isinstance(condition, Column) and condition._sql is None:
-            self._sql.append(lambda: f'''WHEN {condition}''')
-            return self
+            return self._push((WHEN, identify(condition)), _words, (WHEN, condition))
         return self._conditional(condition, param, WHEN)
 
 
+class Array(object):
+    """IN options travelling as one bound argument, expanded for the vendor only when
+    the query is executed"""
+    __slots__ = ('options', 'jsonable', 'param')
+
+    def __init__(self, options: Tuple[Any, ...]):
+        self.options = options
+        # IN(Param('ids')) stands for the whole list, supplied when a Template executes
+        self.param = options[0] if len(options) == 1 and isinstance(options[0], Param) else None
+        self.jsonable = self.param is not None or all(
+            option is None or isinstance(option, (str, int, float)) for option in options
+        )
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, Array) and other.options == self.options
+
+    def __repr__(self) -> str:
+        return f'Array{self.options}'
+
+    def bind(self, dialect: Dialect) -> List[Any]:
+        # a Template swaps the Array for the bound list of its Param
+        if self.param is not None: return [self]
+        return dialect.bind(self.options, self.jsonable)
+
+
+# clause renderers, the Compiler calls them with the operands their builder stored
+
+def _words(c: Compiler, *words) -> str:
+    return ' '.join([str(word) for word in words])
+
+
+def _conditional(c: Compiler, command: str, condition: Column | str) -> str:
+    placeholder = c.placeholder()
+    if isinstance(condition, str): return f'{command} {condition}'
+    sql = condition._sql() if callable(condition._sql) else condition._sql
+    return f'{command} {sql.replace(SYM, placeholder)}'
+
+
+def _inlined(c: Compiler, command: str, condition: Column | str) -> str:
+    # CASE branches carry their values in the SQL text instead of binding them
+    if not isinstance(condition, Column): return f'{command} {Column.QUOTE(condition)}'
+    sql = condition._sql() if callable(condition._sql) else condition._sql
+    return f'{command} {sql.replace(SYM, str(Column.QUOTE(condition._arg)))}'
+
+
+def _copy(c: Compiler, table: Table, columns: List[Column]) -> str:
+    names = ', '.join(column._name if isinstance(column, Column) else str(column) for column in columns)
+    if c.dialect.copy: return f'COPY {table} ({names}) FROM STDIN'
+    return f'INSERT INTO {table} ({names}) VALUES ({c.placeholders(len(columns))})'
+
+
+def _from(c: Compiler, tables: tuple) -> str:
+    return f'''FROM {', '.join([Table.COERCE(table) for table in tables])}'''
+
+
+def _in(c: Compiler, array: Array) -> str:
+    if array.param is not None and not c.dialect.arrays:
+        raise ValueError(f'{c.dialect.name} expands IN options, IN(Param) is only supported where IN binds an array')
+    return c.dialect.contains(c, array.options, array.jsonable)
+
+
+def _insert(c: Compiler, columns: tuple, table: Table = None) -> str:
+    names = f'''({', '.join([str(column) for column in columns])})'''
+    return names if table is None else f'INSERT INTO {table} {names}'
+
+
+def _limit(c: Compiler, command: str, value: int) -> str:
+    return c.dialect.limit(value) if command == LIMIT else c.dialect.offset(value)
+
+
+def _order_by(c: Compiler, column: Column) -> str:
+    return f'ORDER BY {column._sql or column}'
+
+
+def _grouped(c: Compiler, opens: bool, closes: bool, render, *operands) -> str:
+    # WHERE a OR b continued by PAGINATE, its own condition must not bind to b alone
+    sql = render(c, *operands)
+    if opens:
+        command, _, condition = sql.partition(' ')
+        sql = f'{command} ({condition}'
+    return f'{sql})' if closes else sql
+
+
+def _paginate(c: Compiler, command: str, names: tuple, comparison: str) -> str:
+    return f'''{command} ({', '.join(names)}) {comparison} ({c.placeholders(len(names))})'''
+
+
+def _select(c: Compiler, columns: tuple) -> str:
+    if not columns: return 'SELECT *'
+    return f'''SELECT {', '.join([c.render(f) if isinstance(f, SQLS) else Column.COERCE(f) for f in columns])}'''
+
+
+def _set(c: Compiler, columns: tuple) -> str:
+    return f'''SET {', '.join([f'{column} = {c.placeholder()}' for column in columns])}'''
+
+
+def _upsert(c: Compiler, conflict: tuple, update: tuple) -> str:
+    return c.dialect.upsert(conflict, update)
+
+
+def _values(c: Compiler, count: int, multirow: bool) -> str:
+    rows = c.rows if multirow else 1
+    if not c.numbered:
+        c.position += rows * count
+        placeholders = f'''({', '.join([c.marker] * count)})'''
+        return f'''VALUES {', '.join([placeholders] * rows)}'''
+    return f'''VALUES {', '.join([f'({c.placeholders(count)})' for _ in range(rows)])}'''
+
+
 class Query(SQLS):
+    """Immutable query builder. Each clause method returns a new Query linked to the
+    clauses of the one it was called on, so a partially built query can be reused as
+    a template any number of times without the variants interfering."""
+    __slots__ = ('_engine', '_vals', '_zero', '_records', '_multirow', '_ttl', '_page')
+
     def __init__(self, engine: 'Supersql'):
         super().__init__()
         self._engine = engine
-        self._args = []
-        self._vals = []
+        self._vals = ()
         self._zero = None
-
-    def _clone(self):
-        this = Query(self._engine)
-        this._sql = [s for s in self._sql]
-        this._args = [a for a in self._args]
+        self._records = None
+        self._multirow = False
+        self._ttl = None
+        self._page = None
+
+    def _derive(self) -> 'Query':
+        this = Query.__new__(Query)
+        this._node = self._node
+        this._engine = self._engine
+        this._vals = self._vals
+        this._zero = self._zero
+        this._records = self._records
+        this._multirow = self._multirow
+        this._ttl = self._ttl
+        this._page = self._page
         return this
 
+    _clone = _derive
+
+    @property
+    def _args(self) -> List[Any]:
+        args = []
+        dialect = self._engine.dialect
+        for node in self._nodes():
+            for arg in node.args:
+                if isinstance(arg, Array): args.extend(arg.bind(dialect))
+                else: args.append(arg)
+        return args
+
     def _conditional(self, condition: Column, param: any, command: str):
         if(isinstance(condition, str)):
             if not param:
@@ -112,63 +341,308 @@ class Query(SQLS):
             ''')
 
         if isinstance(condition, str):
-            self._args.append(Column.QUOTE(param))
+            arg = Column.QUOTE(param)
         else:
-            self._args.append(condition._arg)
+            arg = condition._arg
+        return self._push((command, identify(condition)), _conditional, (command, condition), (arg,))
 
+    @property
+    def database(self):
+        """Reflected table metadata of the engine i.e. query.database.table('employees')"""
+        return self._engine.database
 
-        # NOTE: self inside _() will be self of original
-        # query i.e. complete closure every time it is
-        # called it will append to local lists etc so we clone
-        this = self._clone()
-        def _():
-            if isinstance(condition, str):
-                # this._args.append(Column.QUOTE(param))
-                sql = f'{command} {condition}'
-            else:
-                # this._args.append(condition._arg)
-                arguments = len(this._args)
-                vendor = this._engine._vendor
-                if vendor == POSTGRES: placeholder = f'${arguments}'
-                else: placeholder = '?'
-                column_sql = condition._sql.replace('--?--', placeholder)
-                sql = f'''{command} {column_sql}'''
-            return sql
-        self._sql.append(_)
-        return self
+    @property
+    def fingerprint(self) -> Hashable:
+        """Vendor plus the structural key of every clause in the builder chain. Two
+        queries with equal fingerprints render identical SQL text and placeholders"""
+        dialect = self._engine.dialect
+        if dialect.arrays: return (dialect.name, *self._keys)
+        # IN renders a placeholder per option, the number of options is part of the text
+        return (dialect.name, *[
+            (IN, len(node.operands[0].options)) if node.key == IN else node.key for node in self._nodes()
+        ])
+
+    def compile(self, rows: int = None) -> str:
+        """Render the SQL text for this query, reusing the text rendered by an earlier
+        query of the same shape from the engine's statement cache when available.
+        For multirow VALUES, rows is the number of row tuples rendered (one chunk)."""
+        key = self.fingerprint
+        if self._multirow:
+            rows = rows or self._chunk_rows()
+            key = (*key, rows)
+        statements = self._engine._statements
+        try: sql = statements.get(key)
+        except TypeError: key = sql = None  # unhashable operand i.e. a list in CASE
+        if sql is None:
+            sql = Compiler(self._engine.dialect, rows).render(self)
+            if key is not None: statements.put(key, sql)
+        return sql
+
+    def __str__(self) -> str:
+        return Compiler(self._engine.dialect, self._chunk_rows() if self._multirow else None).render(self)
+
+    def _chunk_rows(self) -> int:
+        return min(len(self._vals), self._chunk_size())
+
+    def _chunk_size(self) -> int:
+        """Most VALUES rows a single statement can bind within the vendor parameter limit"""
+        return max(1, self._engine.dialect.max_parameters // len(self._vals[0]))
+
+    def _bindings(self) -> List[Any]:
+        """Arguments bound to the compiled statement, a single VALUES row binds its values"""
+        return list(self._vals[0]) if len(self._vals) == 1 else self._args
 
-    async def go(self, Model : T = None) -> Iterable[T]:
-        sql = ' '.join(s() for s in self._sql)
+    @property
+    def tables(self) -> frozenset:
+        """Names of the tables this query reads from or writes to"""
+        tables = set()
+        for key in self._keys:
+            if not isinstance(key, tuple): continue
+            if key[0] in (FROM, JOIN, UPDATE, INTO, COPY): operands = key[1:]
+            elif key[:2] == (INSERT, INTO): operands = key[2:3]
+            else: continue
+            for operand in operands:
+                if isinstance(operand, str): tables.add(operand.split()[0])
+                elif isinstance(operand, tuple) and operand[0] is Table: tables.add(operand[1])
+                if key[0] in (JOIN, UPDATE, INTO, COPY): break
+        return frozenset(tables)
+
+    def cached(self, ttl: float = 60.0) -> 'Query':
+        """Serve this SELECT from the engine's result cache for up to ttl seconds. Entries
+        are keyed on the compiled SQL and its arguments and dropped as soon as an INSERT,
+        UPDATE, DELETE or COPY against one of its tables runs through the same engine"""
+        if not isinstance(ttl, (int, float)) or ttl <= 0:
+            raise ValueError('cached ttl must be a positive number of seconds')
+        this = self._derive()
+        this._ttl = ttl
+        return this
+
+    async def go(self, Model : T = None, format: str = 'rows', validate: bool = True) -> Iterable[T]:
+        """Execute the query. SELECTs return lazy Rows of Row or Model objects, or a dict
+        of typed column buffers (see supersql.columns) when format is 'columns'. With
+        validate False pydantic Models are built without validating the rows"""
+        started = perf_counter()
+        sql, args = self.compile(), self._bindings()
+        compiled = perf_counter() - started
+        if self._ttl is None or self._zero != SELECT or not self._engine._cacheable:
+            results = await self._execute(sql, args, Model, format, compiled)
+        else: results = await self._cached(sql, args, Model, format, compiled)
+        if format != 'rows': return results
+        if not validate and isinstance(results, Rows): results = Rows(results.rows, Model, validate)
+        return results if self._page is None else self._paginated(results)
+
+    async def _cached(self, sql: str, args: List[Any], Model: T, format: str, compiled: float):
+        results = self._engine._results
+        # postgres binds an IN list as one array argument
+        key = (sql, tuple(tuple(arg) if isinstance(arg, list) else arg for arg in args), format)
+        try: hit = results.get(key)
+        except TypeError: return await self._execute(sql, args, Model, format, compiled)  # unhashable argument
+        if hit is None:
+            hit = await self._execute(sql, args, None, format, compiled)
+            if format == 'rows': hit = hit.rows
+            results.set(key, hit, self._ttl, self.tables)
+        return Rows(hit, Model) if format == 'rows' else hit
+
+    @property
+    def _returning(self) -> bool:
+        return any(isinstance(key, tuple) and key[0] == RETURNING for key in self._keys)
+
+    def _parenthesized(self) -> 'Query':
+        """Same query with its WHERE condition in parentheses so a condition appended
+        to it holds for the whole of it i.e. WHERE (a OR b) AND c"""
+        nodes = self._nodes()
+        start = next(i for i, node in enumerate(nodes) if isinstance(node.key, tuple) and node.key[0] == WHERE)
+        parent, last = nodes[start].parent, len(nodes) - 1
+        for i in range(start, len(nodes)):
+            node, opens, closes = nodes[i], i == start, i == last
+            if opens or closes:
+                operands = (opens, closes, node.render, *node.operands)
+                parent = Clause(parent, ('(', opens, closes, node.key), _grouped, operands, node.args)
+            else: parent = Clause(parent, node.key, node.render, node.operands, node.args)
+        this = self._derive()
+        this._node = parent
+        return this
+
+    def _paginated(self, rows: Rows) -> Page:
+        fields, size = self._page
+        records = rows.rows
+        token = None
+        if len(records) == size:
+            last = records[-1]
+            try: token = tokenize([last[field] for field in fields])
+            except (KeyError, IndexError):
+                raise ValueError('PAGINATE order columns must be amongst the selected columns') from None
+        return Page(records, rows._model, token, rows._validate)
+
+    async def _execute(self, sql: str, args: List[Any], Model: T = None, format: str = 'rows', compiled: float = 0.0):
+        if format not in ('rows', 'columns'):
+            raise ValueError(f'go format must be one of rows or columns not {format}')
         zero = self._zero
-        pooled = self._engine._pooled
-        ispg = self._engine.vendor == POSTGRES
-        connexion = self._engine._connexion
+        dialect = self._engine.dialect
+        instruments = self._engine._instruments
+        execution = instruments.start(sql, args, compiled)
 
         async def going(conn):
+            if zero == COPY: return await self._copying(conn, dialect)
+            if self._multirow: return await self._batching(conn, dialect, Model)
             if zero == SELECT:
-                if ispg: results = await conn.fetch(sql, *self._args)
+                prepared = self._engine._prepared
+                if dialect.prepared: results = await prepared.fetch(conn, sql, args)
                 else:
-                    results = await conn.execute_fetchall(sql, self._args)
-                return Rows(results, Model)
-
-            if len(self._vals) > 1:
-                results = await conn.executemany(sql, tuple(self._vals))
+                    results = await conn.execute_fetchall(sql, args)
+                execution.execute = execution.lap()
+                execution.rows = len(results)
+                if format == 'columns':
+                    names, types = prepared.describe(conn, sql) if dialect.prepared else (None, None)
+                    decoded = columns(results, names, types)
+                else: decoded = Rows(results, Model)
+                execution.decode = execution.lap()
+                return decoded
+
+            # sqlite and mysql writes are committed here unless the caller already opened a transaction
+            async with nullcontext() if dialect.prepared else atomic(conn, False):
+                if len(self._vals) > 1:
+                    await conn.executemany(sql, tuple(self._vals))
+                    return Rows([], Model)
+                if not dialect.prepared: results = await conn.execute_fetchall(sql, args)
+                elif self._returning: results = await self._engine._prepared.fetch(conn, sql, args)
+                else:
+                    # RAW scripts can not be prepared and one off writes have no use for a plan
+                    await conn.execute(sql, *args)
+                    results = []
+            return Rows(results, Model)
+
+        try:
+            async with self._engine._acquire(write=zero != SELECT) as connection:
+                execution.acquire = execution.lap()
+                results = await going(connection)
+        except BaseException as error:
+            instruments.finish(execution, error=error)
+            raise
+        instruments.finish(execution, results)
+        if zero != SELECT:
+            tables = self.tables
+            if tables: self._engine._wrote(tables)
+        return results
+
+    async def _copying(self, conn, dialect: Dialect) -> int:
+        table, columns, records = self._records
+        names = [c._name if isinstance(c, Column) else str(c) for c in columns]
+        tablename = table.__tn__ if isinstance(table, Table) else str(table)
+        if dialect.copy:
+            schema, _, name = tablename.rpartition('.')
+            status = await conn.copy_records_to_table(
+                name, records=records, columns=names, schema_name=schema or None
+            )
+            return int(status.split()[-1])
+
+        # without COPY stream multi row INSERTs sized to the bind parameter limit
+        size = max(1, dialect.max_parameters // len(names))
+        prefix = f'''INSERT INTO {tablename} ({', '.join(names)}) VALUES '''
+        def inserting(rows: int) -> str:
+            c = Compiler(dialect)
+            return prefix + ', '.join([f'({c.placeholders(len(names))})' for _ in range(rows)])
+        statement = None
+        total = 0
+        async with atomic(conn, dialect.prepared):
+            async for chunk in chunked(records, size):
+                if len(chunk) == size:
+                    statement = statement or inserting(size)
+                    sql = statement
+                else: sql = inserting(len(chunk))
+                await conn.execute(sql, [value for record in chunk for value in record])
+                total += len(chunk)
+        return total
+
+    async def _batching(self, conn, dialect: Dialect, Model: T = None):
+        vals = self._vals
+        size = self._chunk_size()
+        prepared = self._engine._prepared
+        results = []
+        # asyncpg commits a lone statement on its own, sqlite and mysql commit it here
+        async with atomic(conn, dialect.prepared) if len(vals) > size or not dialect.prepared else nullcontext():
+            for start in range(0, len(vals), size):
+                chunk = vals[start:start + size]
+                sql = self.compile(rows=len(chunk))
+                args = [value for row in chunk for value in row]
+                if not dialect.prepared: results.extend(await conn.execute_fetchall(sql, args))
+                elif self._returning: results.extend(await prepared.fetch(conn, sql, args))
+                else: await conn.execute(sql, *args)
+        return Rows(results, Model)
+
+    def run(self, Model : T = None, format: str = 'rows', validate: bool = True) -> Iterable[T]:
+        """Synchronous go() for engines connected with Supersql.connects(), executes the
+        very same compiled SQL and returns the very same results"""
+        return self._synchronously(self.go(Model, format, validate))
+
+    def _synchronously(self, coroutine):
+        runner = self._engine._runner
+        if runner is None:
+            coroutine.close()
+            raise ValueError('Query.run() requires a synchronous connection i.e. Supersql.connects()')
+        return runner(coroutine)
+
+    def template(self, Model : T = None, format: str = 'rows') -> 'Template':
+        """Freeze this query into a Template compiled once and executed many times with
+        the values of its Param('name') placeholders supplied per call i.e.
+        tpl = query.WHERE(users.id == Param('user_id')).template(); await tpl.go(user_id=5)"""
+        from .template import Template
+        return Template(self, Model, format)
+
+    async def pages(
+        self, columns: List[Column | str], size: int = 100, descending = False, Model: T = None, validate = True
+    ) -> AsyncIterator[Page]:
+        """Walk every row this query matches one PAGINATE page at a time. Each page seeks
+        straight past the last row of the previous one so a page deep into a large table
+        costs the same as the first, unlike OFFSET which rescans everything before it"""
+        token = None
+        while True:
+            page = await self.PAGINATE(columns, after=token, size=size, descending=descending).go(Model, validate=validate)
+            if page: yield page
+            token = page.token
+            if token is None: return
+
+    async def stream(self, batch_size: int = 500, Model: T = None, batched = False) -> AsyncIterator[T]:
+        """Execute a SELECT yielding rows (or Rows batches when batched) fetched batch_size
+        records at a time from a database cursor so memory stays constant regardless of
+        result size. Postgres cursors only live inside a transaction so one is opened for
+        the lifetime of the iteration."""
+        if not isinstance(batch_size, int) or batch_size < 1:
+            raise ValueError('stream batch_size must be a positive integer')
+        sql = self.compile()
+        args = self._args
+        dialect = self._engine.dialect
+
+        async def batches(conn):
+            if dialect.prepared:
+                async with conn.transaction():
+                    statement = await self._engine._prepared.prepare(conn, sql)
+                    cursor = await statement.cursor(*args)
+                    while True:
+                        records = await cursor.fetch(batch_size)
+                        if not records: return
+                        yield records
             else:
-                results = await conn.execute(sql, *self._args)
-            return Rows(results or [], Model)
+                async with conn.execute(sql, args) as cursor:
+                    while True:
+                        records = await cursor.fetchmany(batch_size)
+                        if not records: return
+                        yield records
+
+        async def streaming(conn):
+            async for records in batches(conn):
+                rows = Rows(records, Model)
+                if batched: yield rows
+                else:
+                    for row in rows: yield row
 
-        if ispg:
-            if pooled:
-                async with connexion.acquire() as connection:
-                    return await going(connection)
-            return await going(connexion)
-        else: return await going(connexion) # sqlite then until more databaseas added
+        async with self._engine._acquire() as connection:
+            async for row in streaming(connection): yield row
 
     def _limit_offset(self, value: int, command: str):
         if not isinstance(value, int):
             raise ValueError(f'{command} only accepts integer values')
-        self._sql.append(lambda : f'''{command} {value}''')
-        return self
+        return self._push((command, value), _limit, (command, value))
 
     def utils(self, name, parameterize = False):
         """Returns a dictionary of useful methods and helpers for working with SQL
@@ -184,67 +658,69 @@ class Query(SQLS):
         return self._conditional(condition, param, AND)
 
     def ASC(self) -> 'Query':
-        def _():
-            return f'ASC'
-        self._sql.append(_)
-        return self
+        return self._push(ASC, _words, (ASC,))
+
+    def COPY_INTO(self, table: Table, columns: List[Column], records: Iterable[Tuple[any]]) -> 'Query':
+        """Bulk load records (any iterable or async iterable of tuples, consumed lazily)
+        into table. Postgres uses the COPY protocol, sqlite falls back to multi row INSERT
+        statements inside a single transaction. go() returns the number of rows loaded."""
+        if not columns:
+            raise ValueError('COPY_INTO requires the list of columns being loaded')
+        return self._push(
+            (COPY, identify(table), *(identify(c) for c in columns)), _copy, (table, columns),
+            _zero=self._zero or COPY, _records=(table, columns, records)
+        )
 
     def CREATE(self, artifact: Table | Enum) -> 'Query':
         if isinstance(artifact, Table):
-            print(':::' * 10, artifact.__tn__)
             table = artifact.__tn__ or type(artifact).__name__
-            self._sql.append(lambda: f'CREATE TABLE {tableize(table)}')
+            return self._push((CREATE, table), _words, ('CREATE TABLE', tableize(table)))
         if isinstance(artifact, Enum):
             # create type snake_case(artifact) as enum ()
             pass
         return self
 
     def DESC(self) -> 'Query':
-        def _():
-            return f'DESC'
-        self._sql.append(_)
-        return self
+        return self._push(DESC, _words, (DESC,))
 
     def DELETE(self) -> 'Query':
-        self._sql.append(lambda : 'DELETE')
-        return self
+        return self._push(DELETE, _words, (DELETE,))
 
     def FROM(self, *tables: List[str | int]) -> 'Query':
-        def _():
-            _tables = [Table.COERCE(t) for t in tables]
-            return f'''FROM {', '.join(_tables)}'''
-        self._sql.append(_)
-        return self
+        return self._push((FROM, *(identify(t) for t in tables)), _from, (tables,))
 
     def IN(self, *options) -> 'Query':
-        arguments = len(self._args)
-        self._args.extend(options)
-        self._sql.append(lambda: f'''IN ({', '.join([f'${arguments + index + 1}' for index, _ in enumerate(options)])})''')
-        return self
+        """Membership test bound as a single array parameter so the SQL text does not
+        change with the number of options, postgres renders = ANY($n) and sqlite reads
+        a JSON array back with json_each (or binds one ? per option when an option has
+        no JSON representation i.e. bytes or dates). MySQL binds one %s per option"""
+        array = Array(options)
+        key = IN if array.jsonable else (IN, len(options))
+        return self._push(key, _in, (array,), (array,))
 
     def INTO(self, table: Table) -> 'Query':
-        try: self._sql[-2]
-        except: self._sql.append(lambda : f'INTO {table}')
-        else: self._sql[-2] = lambda : f'INSERT INTO {table}'
-        return self
+        columns = self._node
+        placeholder = columns.parent if columns else None
+        if placeholder is None or placeholder.key != INSERT:
+            return self._push((INTO, identify(table)), _words, (INTO, table))
+        # INSERT(...).INTO(table): swap the INSERT placeholder for INSERT INTO table
+        this = self._derive()
+        into = Clause(placeholder.parent, (INSERT, INTO, identify(table)), _words, (INSERT, INTO, table))
+        this._node = Clause(into, columns.key, columns.render, columns.operands, columns.args)
+        return this
 
     def INSERT(self, *columns: Column) -> 'Query':
-        self._zero = self._zero or INSERT
-        def _():
-            return f'''({', '.join(str(column) for column in columns)})'''
-        self._sql.extend([lambda : '--', _])
-        return self
+        this = self._push(INSERT, _words, ('--',), _zero=self._zero or INSERT)
+        return this._push((INSERT, *(identify(c) for c in columns)), _insert, (columns,))
 
     def INSERT_INTO(self, table: Table, columns: List[Column]) -> 'Query':
-        self._zero = self._zero or INSERT
-        def _():
-            return f'''INSERT INTO {table} ({', '.join(str(column) for column in columns)})'''
-        self._sql.append(_)
-        return self
+        return self._push(
+            (INSERT, INTO, identify(table), *(identify(c) for c in columns)), _insert, (columns, table),
+            _zero=self._zero or INSERT
+        )
 
     def JOIN(self, table: Table) -> 'Query':
-        self._sql.append(lambda: f'JOIN {table}')
-        return self
+        return self._push((JOIN, identify(table)), _words, (JOIN, table))
 
     def LIMIT(self, limit: int) -> 'Query':
         return self._limit_offset(limit, LIMIT)
@@ -253,27 +729,48 @@ class Query(SQLS):
         return self._limit_offset(offset, OFFSET)
 
     def ON(self, condition: Column):
-        self._sql.append(lambda: f'ON {condition}')
-        return self
+        return self._push((ON, identify(condition)), _words, (ON, condition))
 
     def OR(self, condition: Column | str, param = None) -> 'Query':
         return self._conditional(condition, param, OR)
 
     def ORDER_BY(self, column: Column) -> 'Query':
-        def _():
-            return f'''ORDER BY {column._sql or column}'''
-        self._sql.append(_)
-        return self
+        return self._push((ORDER_BY, identify(column)), _order_by, (column,))
+
+    def PAGINATE(
+        self, columns: List[Column | str], after: str = None, size: int = 100, descending = False
+    ) -> 'Query':
+        """Keyset pagination, renders WHERE (a, b) > ($1, $2) ORDER BY a, b LIMIT size
+        where the values come from the after token of the previous page. go() returns a
+        Page of rows whose token continues after its last row. The order columns must be
+        selected and together unique i.e. end with the primary key."""
+        if not columns:
+            raise ValueError('PAGINATE requires the columns the pages are ordered by')
+        if not isinstance(size, int) or size < 1:
+            raise ValueError('PAGINATE size must be a positive integer')
+        keys = self._keys
+        if any((key[0] if isinstance(key, tuple) else key) in (ORDER_BY, LIMIT, OFFSET) for key in keys):
+            raise ValueError('PAGINATE renders its own ORDER BY and LIMIT, remove them from the query')
+        names = tuple(str(Column(c._name, c._table)) if isinstance(c, Column) else str(c) for c in columns)
+        fields = tuple((c._alias or c._name) if isinstance(c, Column) else str(c).rpartition('.')[2] for c in columns)
+        comparison = '<' if descending else '>'
+
+        this = self
+        if after is not None:
+            values = tuple(detokenize(after, len(columns)))
+            command = AND if any(isinstance(key, tuple) and key[0] == WHERE for key in keys) else WHERE
+            # an OR inside the existing condition, even one in a string, must not take the seek with it
+            if command == AND: this = this._parenthesized()
+            this = this._push((command, comparison, names), _paginate, (command, names, comparison), values)
+        order = ', '.join(f'{name} DESC' if descending else name for name in names)
+        this = this._push((ORDER_BY, names, descending), _words, (ORDER_BY, order))
+        return this._push((LIMIT, size), _words, (LIMIT, size), _page=(fields, size))
 
     def RAW(self, statement: str):
-        self._sql.append(lambda: statement)
-        return self
+        return self._push((RAW, statement), _words, (statement,))
 
     def RETURNING(self, column: Column) -> 'Query':
-        def _():
-            return f'RETURNING {column}'
-        self._sql.append(_)
-        return self
+        return self._push((RETURNING, identify(column)), _words, (RETURNING, column))
 
     def SELECT(self, *columns) -> 'Query':
         """Pythonic interface to SQL SELECT allowing python
@@ -284,35 +781,38 @@ class Query(SQLS):
             Supersql Column Type.
             Raises an error if a type other than str | Column is used.
         """
-        self._zero = self._zero or SELECT
-        def _():
-            _columns = [str(f) if isinstance(f, SQLS) else Column.COERCE(f) for f in columns]
-            print(_columns)
-            return f'''SELECT {', '.join(_columns)}''' if _columns else 'SELECT *'
-        self._sql.append(_)
-        return self
+        return self._push((SELECT, *(identify(c) for c in columns)), _select, (columns,), _zero=self._zero or SELECT)
 
     def SET(self, **kwargs) -> 'Query':
-        statements = []
-        vendor = self._engine._vendor
-        for column in kwargs:
-            arg = Column.QUOTE(kwargs.get(column))
-            self._args.append(arg)
-            if vendor == POSTGRES: placeholder = f'${len(self._args)}'
-            else: placeholder = '?'
-            statements.append(f'{column} = {placeholder}')
-
-        def _():
-            return f"SET {', '.join(statements)}"
-        self._sql.append(_)
-        return self
+        columns = tuple(kwargs)
+        args = tuple(Column.QUOTE(value) for value in kwargs.values())
+        return self._push((SET, *columns), _set, (columns,), args)
 
     def UPDATE(self, table: Table) -> 'Query':
-        self._zero = self._zero or UPDATE
-        self._sql.append(lambda : f'''UPDATE {table}''')
-        return self
-
-    def VALUES(self, *matrix: Tuple[any]) -> 'Query':
+        return self._push((UPDATE, identify(table)), _words, (UPDATE, table), _zero=self._zero or UPDATE)
+
+    def UPSERT(self, *conflict: Column | str, update: List[Column | str] = None) -> 'Query':
+        """Turn the INSERT into an update of the row it conflicts with on the conflict
+        columns (a primary key or unique constraint). update lists the columns that are
+        overwritten, by default every inserted column outside conflict, an empty list
+        leaves the existing row untouched. Renders ON CONFLICT on postgres and sqlite and
+        ON DUPLICATE KEY UPDATE on mysql"""
+        if not conflict:
+            raise ValueError('UPSERT requires the columns whose uniqueness is being violated')
+        name = lambda column: column._name if isinstance(column, Column) else str(column)
+        inserted = next((node.operands[0] for node in self._nodes() if node.render is _insert), None)
+        if inserted is None:
+            raise ValueError('UPSERT only follows an INSERT i.e. INSERT_INTO(table, columns).VALUES(...).UPSERT(table.id)')
+        conflict = tuple(name(column) for column in conflict)
+        if update is None: update = tuple(name(c) for c in inserted if name(c) not in conflict)
+        else: update = tuple(name(column) for column in update)
+        return self._push((UPSERT, conflict, update), _upsert, (conflict, update))
+
+    def VALUES(self, *matrix: Tuple[any], multirow = False) -> 'Query':
+        """Rows to insert. By default a single row placeholder tuple is rendered and
+        several rows are sent with executemany. With multirow the rows are rendered as
+        one VALUES (...), (...) list, go() splits them into as few statements as the
+        vendor bind parameter limit allows and runs them in one transaction."""
         msg = 'VALUES expects a tuple if inserting a row or multiple tuples if inserting multiple rows'
         homogeneous = set()
         for values in matrix:
@@ -321,21 +821,11 @@ class Query(SQLS):
             homogeneous.add(len(values))
         if len(homogeneous) > 1:
             raise SyntaxError('VALUES matrix has tuples of different lengths')
-        def _():
-            vendor = self._engine._vendor
-            count = homogeneous.copy().pop()
-            if vendor == POSTGRES:
-                placeholders = [f'${pos + 1}' for pos in range(count)]
-            else:
-                placeholders = ['?'] * count
-            self._vals.extend(matrix)
-            return f'''VALUES ({', '.join(placeholders)})'''
-        self._sql.append(_)
-        return self
+        count = homogeneous.copy().pop()
+        return self._push((VALUES, count, multirow), _values, (count, multirow), _vals=(*self._vals, *matrix), _multirow=multirow)
 
     def WHERE(self, condition: Column | str, param = None) -> 'Query':
         # early exit if condition used without an op i.e. ==, AS, etc
         if isinstance(condition, Column) and condition._sql is None:
-            self._sql.append(lambda: f'''WHERE {condition}''')
-            return self
+            return self._push((WHERE, identify(condition)), _words, (WHERE, condition))
         return self._conditional(condition, param, WHERE)
@@ -0,0 +1,85 @@
+from time import monotonic
+from typing import Any, Dict, List, Optional, Tuple
+
+
+def disconnects() -> Tuple[type, ...]:
+    """Exceptions that mean the target itself is unreachable rather than the query
+    being wrong, only these eject a replica"""
+    errors = (OSError,)
+    try:
+        from asyncpg.exceptions import InterfaceError, PostgresConnectionError
+    except ImportError: return errors
+    return errors + (InterfaceError, PostgresConnectionError)
+
+
+class Replica(object):
+    """Read replica connection (pool) with its in flight request count and health"""
+    __slots__ = ('dsn', 'connexion', 'outstanding', 'ejections', 'ejected_until', 'unreached')
+
+    def __init__(self, dsn: str):
+        self.dsn = dsn
+        self.connexion = None
+        self.outstanding = 0
+        self.ejections = 0
+        self.ejected_until = 0.0
+        # could not be connected to, connecting is tried again once the cooldown is over
+        self.unreached = False
+
+    @property
+    def due(self) -> bool:
+        return self.unreached and monotonic() >= self.ejected_until
+
+    @property
+    def healthy(self) -> bool:
+        return self.connexion is not None and monotonic() >= self.ejected_until
+
+    def eject(self, cooldown: float):
+        self.ejections += 1
+        self.ejected_until = monotonic() + cooldown
+
+    def restore(self):
+        self.ejected_until = 0.0
+
+
+class Replicas(object):
+    """Read replicas of one primary. SELECTs go to the healthy replica with the fewest
+    outstanding requests, a replica that fails to connect is ejected for cooldown
+    seconds after which it is tried again (or restored early by Supersql.ping())"""
+    def __init__(self, dsns: List[str], cooldown: float = 30.0):
+        if cooldown < 0: raise ValueError('Replica cooldown must be a positive number of seconds')
+        self._replicas = [Replica(dsn) for dsn in dsns or ()]
+        self._cooldown = cooldown
+        self._turn = 0
+
+    def __bool__(self) -> bool:
+        return bool(self._replicas)
+
+    def __iter__(self):
+        return iter(self._replicas)
+
+    def __len__(self) -> int:
+        return len(self._replicas)
+
+    @property
+    def cooldown(self) -> float:
+        return self._cooldown
+
+    def pick(self) -> Optional[Replica]:
+        """Least outstanding requests among healthy replicas, ties rotate so idle
+        replicas share the load instead of the first one taking all of it"""
+        replicas = self._replicas
+        count = len(replicas)
+        best = None
+        for n in range(count):
+            replica = replicas[(self._turn + n) % count]
+            if replica.healthy and (best is None or replica.outstanding < best.outstanding):
+                best = replica
+        self._turn = (self._turn + 1) % count if count else 0
+        return best
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        return [{
+            'outstanding': replica.outstanding,
+            'healthy': replica.healthy,
+            'ejections': replica.ejections,
+        } for replica in self._replicas]
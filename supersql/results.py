@@ -1,49 +1,105 @@
-from typing import List, Union
-from asyncpg import Record
+from typing import Any, Dict, Iterator, List, Union
+
+from .columns import columns
+from .hydration import hydrator
 
 
 class Row():
+    """Read only view over a driver record i.e. asyncpg.Record or aiosqlite.Row,
+    columns are looked up on the underlying record and never copied"""
+    __slots__ = ('_current',)
+
     def __init__(self, current):
         self._current = current
 
     def __getattr__(self, k: str):
-        return self._data.get(k)
+        try: return self._current[k]
+        except (KeyError, IndexError):
+            raise AttributeError(f'Row has no column named {k}') from None
+
+    def __getitem__(self, k: Union[str, int]):
+        return self._current[k]
+
+    def __len__(self) -> int:
+        return len(self._current)
+
+    def __repr__(self) -> str:
+        return f'<Row { {k: self._current[k] for k in self.keys()} }>'
 
     def column(self, k: Union[str, int]):
         return self._current[k]
 
+    def keys(self) -> List[str]:
+        return list(self._current.keys())
+
 
 class Rows():
-    def __init__(self, rows: list, Model = None):
-        self._step = -1
+    """Lazy container over the records returned by the driver. Row (or Model)
+    objects are only built when a record is accessed, the container can be
+    indexed, sliced and iterated as many times as needed. Models are built by a
+    constructor compiled once per Model and column layout (see supersql.hydration),
+    validate=False lets pydantic models skip validation of trusted rows"""
+    __slots__ = ('_data', '_model', '_validate', '_make')
+
+    def __init__(self, rows: list, Model = None, validate: bool = True):
         self._data = rows
-        self._rows = [Model(**dict(row)) for row in rows] if Model else [Row(row) for row in rows]
-    
+        self._model = Model
+        self._validate = validate
+        self._make = None
+
     def __len__(self):
-        return len(self._rows)
+        return len(self._data)
 
     def __bool__(self):
         return bool(self._data)
 
-    def __iter__(self):
-        return self
+    def __getitem__(self, index: Union[int, slice]):
+        if isinstance(index, slice):
+            return Rows(self._data[index], self._model, self._validate)
+        return self._wrap(self._data[index])
+
+    def __iter__(self) -> Iterator[Row]:
+        data = self._data
+        if self._model is None or not data:
+            for record in data:
+                yield Row(record)
+            return
+        make = self._maker(data[0])
+        for record in data:
+            yield make(record)
 
-    def __next__(self):
-        self._step += 1
-        if self._step < len(self._rows):
-            return self._rows[self._step]
-        raise StopIteration
+    def _maker(self, record):
+        make = self._make
+        if make is None: make = self._make = hydrator(self._model, record, self._validate)
+        return make
+
+    def _wrap(self, record):
+        if self._model is None: return Row(record)
+        return self._maker(record)(record)
 
     def row(self, n: int):
-        n = n - 1
-        if n < 0: raise IndexError('Only positive row counts please...')
-        return self._rows[n - 1]
+        if n < 1: raise IndexError('Only positive row counts please...')
+        return self._wrap(self._data[n - 1])
+
+    def to_columns(self, types: List[str] = None) -> Dict[str, Any]:
+        """Column name to typed buffer mapping built straight off the driver records"""
+        return columns(self._data, types=types)
 
     @property
-    def rows(self) -> List[Row]:
+    def rows(self) -> list:
         return self._data
 
 
+class Page(Rows):
+    """One page of a PAGINATE query, token continues after its last row and is None
+    once a page comes back short i.e. there is nothing after it"""
+    __slots__ = ('token',)
+
+    def __init__(self, rows: list, Model = None, token: str = None, validate: bool = True):
+        super().__init__(rows, Model, validate)
+        self.token = token
+
+
 # row = rows.row(5) -> Row
-# rows = rows.rows[:3] -> List[Row]
+# rows = rows[:3] -> Rows
 # row.first_name -> str
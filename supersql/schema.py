@@ -0,0 +1,235 @@
+from json import dump, load
+from os import replace
+from os.path import exists
+from time import time
+from typing import Any, Dict, List, Optional
+
+from .column import Column
+from .constants import POSTGRES, POSTGRESQL, SQLITE
+from .table import Table
+
+
+# one round trip for every column of every (requested) table in the schema, with its
+# primary key membership and the indexes covering it
+POSTGRES_REFLECTION = '''SELECT c.relname AS table_name, a.attname AS column_name,
+    format_type(a.atttypid, a.atttypmod) AS data_type, t.typname AS type_name,
+    NOT a.attnotnull AS nullable, pg_get_expr(d.adbin, d.adrelid) AS column_default,
+    EXISTS (
+        SELECT 1 FROM pg_index p WHERE p.indrelid = c.oid AND p.indisprimary AND a.attnum = ANY(p.indkey)
+    ) AS primary_key,
+    ARRAY(
+        SELECT i.relname FROM pg_index x JOIN pg_class i ON i.oid = x.indexrelid
+        WHERE x.indrelid = c.oid AND a.attnum = ANY(x.indkey) ORDER BY i.relname
+    ) AS indexes
+FROM pg_class c
+JOIN pg_namespace n ON n.oid = c.relnamespace
+JOIN pg_attribute a ON a.attrelid = c.oid AND a.attnum > 0 AND NOT a.attisdropped
+JOIN pg_type t ON t.oid = a.atttypid
+LEFT JOIN pg_attrdef d ON d.adrelid = c.oid AND d.adnum = a.attnum
+WHERE c.relkind IN ('r', 'v', 'm', 'p') AND n.nspname = $1 AND ($2::text[] IS NULL OR c.relname = ANY($2))
+ORDER BY c.relname, a.attnum'''
+
+SQLITE_REFLECTION = '''SELECT m.name AS table_name, p.name AS column_name, p.type AS data_type,
+    p.type AS type_name, NOT p."notnull" AS nullable, p.dflt_value AS column_default,
+    p.pk > 0 AS primary_key, (
+        SELECT group_concat(l.name) FROM pragma_index_list(m.name) l
+        JOIN pragma_index_info(l.name) i WHERE i.name = p.name
+    ) AS indexes
+FROM sqlite_master m JOIN pragma_table_info(m.name) p
+WHERE m.type IN ('table', 'view') AND m.name NOT LIKE 'sqlite_%'{}
+ORDER BY m.name, p.cid'''
+
+
+def kind(vendor: str, type_name: str) -> Optional[str]:
+    """Normalize a column type to the postgres type names supersql.columns decodes into
+    typed buffers, sqlite declared types are mapped by their affinity rules"""
+    if vendor in (POSTGRES, POSTGRESQL): return type_name
+    declared = (type_name or '').upper()
+    if 'BOOL' in declared: return 'bool'
+    if 'INT' in declared: return 'int8'
+    if any(real in declared for real in ('REAL', 'FLOA', 'DOUB')): return 'float8'
+    return None
+
+
+class Field(object):
+    """Reflected column metadata"""
+    __slots__ = ('name', 'type', 'kind', 'nullable', 'default', 'primary_key', 'indexes')
+
+    def __init__(self, name: str, type: str, kind: str = None, nullable: bool = True,
+                 default: str = None, primary_key: bool = False, indexes: List[str] = ()):
+        self.name = name
+        self.type = type
+        self.kind = kind
+        self.nullable = nullable
+        self.default = default
+        self.primary_key = primary_key
+        self.indexes = list(indexes)
+
+    def __repr__(self) -> str:
+        return f'<Field {self.name} {self.type}>'
+
+    def dump(self) -> Dict[str, Any]:
+        return {slot: getattr(self, slot) for slot in self.__slots__}
+
+
+class Schema(object):
+    """Columns, primary key and indexes of one table as of reflected_at"""
+    def __init__(self, name: str, fields: List[Field], reflected_at: float = None):
+        self.name = name
+        self.fields = {field.name: field for field in fields}
+        self.reflected_at = time() if reflected_at is None else reflected_at
+
+    def __contains__(self, column: str) -> bool:
+        return column in self.fields
+
+    @property
+    def columns(self) -> List[str]:
+        return list(self.fields)
+
+    @property
+    def indexes(self) -> Dict[str, List[str]]:
+        indexes = {}
+        for field in self.fields.values():
+            for index in field.indexes:
+                indexes.setdefault(index, []).append(field.name)
+        return indexes
+
+    @property
+    def primary_key(self) -> List[str]:
+        return [field.name for field in self.fields.values() if field.primary_key]
+
+    def types(self, columns: List[str] = None) -> List[Optional[str]]:
+        """Type names to hand Rows.to_columns(types=...) so decoding skips inference"""
+        return [self.fields[column].kind for column in (columns or self.fields)]
+
+    def dump(self) -> Dict[str, Any]:
+        return {'reflected_at': self.reflected_at, 'fields': [f.dump() for f in self.fields.values()]}
+
+    @classmethod
+    def load(cls, name: str, data: Dict[str, Any]) -> 'Schema':
+        return cls(name, [Field(**field) for field in data['fields']], data['reflected_at'])
+
+
+class Reflected(Table):
+    """Table whose columns are known up front. Every column is built once at reflection
+    so attribute access never reaches __getattr__ unless the column does not exist"""
+    def __init__(self, schema: Schema):
+        super().__init__(schema.name)
+        self.__schema__ = schema
+        for name in schema.fields:
+            self.__dict__[name] = Column(name, self)
+
+    def __getattr__(self, name: str) -> Column:
+        if name.startswith('__') and name.endswith('__'):
+            raise AttributeError(name)
+        raise AttributeError(f'Table {self.__tn__} has no column named {name}')
+
+
+class Database(object):
+    """Reflected table metadata for one engine. Tables are loaded in bulk, cached for
+    ttl seconds (None never expires) and optionally persisted to a JSON snapshot so a
+    fresh process can skip reflection entirely while the snapshot is still fresh"""
+    def __init__(self, engine, ttl: Optional[float] = 300.0, snapshot: str = None):
+        if ttl is not None and ttl < 0:
+            raise ValueError('Reflection ttl must be a positive number of seconds or None')
+        self._engine = engine
+        self._ttl = ttl
+        self._snapshot = snapshot
+        self._schemas: Dict[str, Schema] = {}
+        self._tables: Dict[str, Reflected] = {}
+        self.reflections = 0
+        if snapshot and exists(snapshot): self._load()
+
+    def __contains__(self, table: str) -> bool:
+        return table in self._schemas
+
+    def _fresh(self, table: str) -> bool:
+        schema = self._schemas.get(table)
+        if schema is None: return False
+        return self._ttl is None or time() - schema.reflected_at < self._ttl
+
+    def _load(self):
+        with open(self._snapshot) as f:
+            snapshot = load(f)
+        for name, data in snapshot.get('tables', {}).items():
+            self._schemas[name] = Schema.load(name, data)
+
+    def _save(self):
+        partial = f'{self._snapshot}.tmp'
+        with open(partial, 'w') as f:
+            dump({'tables': {name: schema.dump() for name, schema in self._schemas.items()}}, f)
+        replace(partial, self._snapshot)
+
+    def invalidate(self, *tables: str):
+        """Forget reflected metadata for the given tables or every table"""
+        for table in tables or list(self._schemas):
+            self._schemas.pop(table, None)
+            self._tables.pop(table, None)
+
+    async def reflect(self, *tables: str, schema: str = 'public', refresh: bool = False) -> Dict[str, Schema]:
+        """Load columns, types, primary keys and indexes of the given tables, or every
+        table, in a single round trip. Tables still within ttl are not fetched again"""
+        engine = self._engine
+        stale = [table for table in tables if refresh or not self._fresh(table)]
+        if tables and not stale:
+            return {table: self._schemas[table] for table in tables}
+        dialect = engine.dialect
+        if dialect.name not in (POSTGRES, SQLITE):
+            raise ValueError(f'Schema reflection supports postgres and sqlite, not {dialect.name}')
+        if dialect.prepared:
+            sql, args = POSTGRES_REFLECTION, [schema, stale or None]
+        else:
+            sql = SQLITE_REFLECTION.format(f' AND m.name IN ({", ".join("?" * len(stale))})' if stale else '')
+            args = stale
+        async with engine._acquire() as conn:
+            if dialect.prepared: records = await conn.fetch(sql, *args)
+            else: records = await conn.execute_fetchall(sql, args)
+        self.reflections += 1
+
+        fields: Dict[str, List[Field]] = {}
+        for record in records:
+            indexes = record['indexes'] or []
+            if isinstance(indexes, str): indexes = sorted(indexes.split(','))
+            fields.setdefault(record['table_name'], []).append(Field(
+                record['column_name'],
+                record['data_type'],
+                kind(dialect.name, record['type_name']),
+                bool(record['nullable']),
+                record['column_default'],
+                bool(record['primary_key']),
+                indexes,
+            ))
+        if not tables:
+            self._schemas.clear()
+            self._tables.clear()
+        for table in stale or fields:
+            self._tables.pop(table, None)
+            if table in fields: self._schemas[table] = Schema(table, fields[table])
+            else: self._schemas.pop(table, None)
+        if self._snapshot: self._save()
+        return {table: self._schemas[table] for table in (tables or fields) if table in self._schemas}
+
+    def reflects(self, *tables: str, schema: str = 'public', refresh: bool = False) -> Dict[str, Schema]:
+        """Synchronous reflect() for engines connected with Supersql.connects()"""
+        runner = self._engine._runner
+        if runner is None:
+            raise ValueError('Database.reflects() requires a synchronous connection i.e. Supersql.connects()')
+        return runner(self.reflect(*tables, schema=schema, refresh=refresh))
+
+    def schema(self, table: str) -> Schema:
+        if not self._fresh(table):
+            if self._engine._runner is None:
+                raise ValueError(f'Table {table} is not reflected, await Database.reflect() first')
+            self.reflects(table)
+        if table not in self._schemas:
+            raise ValueError(f'Table {table} does not exist')
+        return self._schemas[table]
+
+    def table(self, table: str) -> Reflected:
+        """Reflected Table object, synchronous engines reflect on demand while async
+        engines must have awaited reflect() for the table within ttl"""
+        schema = self.schema(table)
+        reflected = self._tables.get(table)
+        if reflected is None or reflected.__schema__ is not schema:
+            reflected = self._tables[table] = Reflected(schema)
+        return reflected
@@ -41,7 +41,12 @@ class Table(object):
         self.__alias__ = None
 
     def __getattr__(self, name: str) -> Column:
-        return Column(name, self)
+        # only reached on first access, the column is then cached as a plain attribute
+        if name.startswith('__') and name.endswith('__'):
+            raise AttributeError(name)
+        column = Column(name, self)
+        self.__dict__[name] = column
+        return column
     
     def __str__(self) -> str:
         if self.__alias__:
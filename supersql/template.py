@@ -0,0 +1,73 @@
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, TypeVar
+
+if TYPE_CHECKING: from supersql.query import Query  # pragma: no cover
+
+
+T = TypeVar('T')
+
+
+class Param(object):
+    """Named placeholder whose value is only supplied when a Template executes"""
+    __slots__ = ('name',)
+
+    def __init__(self, name: str):
+        if not isinstance(name, str) or not name.isidentifier():
+            raise ValueError('Param name must be a valid python identifier')
+        self.name = name
+
+    def __repr__(self) -> str:
+        return f'Param({self.name!r})'
+
+
+class Template(object):
+    """Query compiled once and executed repeatedly. Arguments are laid out when the
+    template is created, executing only copies that layout and drops the supplied
+    values into the positions (the $n or ? placeholders) their Param occupies.
+
+    IN(Param('ids')) takes a list whose options must have a JSON representation, it is
+    bound as the one array argument IN renders for the dialect."""
+    __slots__ = ('_query', '_model', '_format', '_layout', '_slots', '_names', '_sql', '_dialect')
+
+    def __init__(self, query: 'Query', Model: T = None, format: str = 'rows'):
+        if query._records is not None or query._multirow or len(query._vals) > 1:
+            raise ValueError('Templates execute a single statement, COPY_INTO and multi row VALUES are not supported')
+        from .query import Array
+        layout = query._bindings()
+        self._query = query
+        self._model = Model
+        self._format = format
+        self._layout = list(layout)
+        self._slots = tuple(
+            (pos, arg.name, False) if isinstance(arg, Param) else (pos, arg.param.name, True)
+            for pos, arg in enumerate(layout) if isinstance(arg, (Array, Param))
+        )
+        self._names = frozenset(name for _, name, _ in self._slots)
+        self._sql = None
+        self._dialect = None
+
+    @property
+    def names(self) -> frozenset:
+        return self._names
+
+    def bind(self, params: Dict[str, Any]) -> List[Any]:
+        if params.keys() != self._names:
+            missing = ', '.join(sorted(self._names - params.keys()))
+            unknown = ', '.join(sorted(params.keys() - self._names))
+            raise ValueError(f'Template parameters missing: [{missing}] unknown: [{unknown}]')
+        args = self._layout.copy()
+        dialect = self._query._engine.dialect
+        for pos, name, array in self._slots:
+            args[pos] = dialect.bind(tuple(params[name]), True)[0] if array else params[name]
+        return args
+
+    def compile(self) -> str:
+        dialect = self._query._engine.dialect
+        if self._sql is None or dialect is not self._dialect:
+            self._sql, self._dialect = self._query.compile(), dialect
+        return self._sql
+
+    async def go(self, **params) -> Iterable[T]:
+        return await self._query._execute(self.compile(), self.bind(params), self._model, self._format)
+
+    def run(self, **params) -> Iterable[T]:
+        return self._query._synchronously(self.go(**params))
@@ -0,0 +1,163 @@
+from contextlib import asynccontextmanager
+from typing import Iterable
+
+from .constants import SQLITE
+from .query import Query
+
+
+class Savepoint(object):
+    """Nested transaction inside a Transaction, rolled back on its own when its block
+    raises while the enclosing transaction carries on"""
+    def __init__(self, transaction: 'Transaction'):
+        self._transaction = transaction
+        self._name = None
+        self._nested = None
+
+    async def __aenter__(self) -> 'Transaction':
+        transaction = self._transaction
+        connection = transaction.connection
+        if transaction._engine.dialect.prepared:
+            # asyncpg turns a transaction opened inside another one into a savepoint
+            self._nested = connection.transaction()
+            await self._nested.start()
+            return transaction
+        transaction._savepoints += 1
+        self._name = f'supersql_{transaction._savepoints}'
+        await connection.execute(f'SAVEPOINT {self._name}')
+        return transaction
+
+    async def __aexit__(self, kind, error, traceback):
+        connection = self._transaction.connection
+        if self._nested is not None:
+            nested, self._nested = self._nested, None
+            if kind is None: await nested.commit()
+            else: await nested.rollback()
+            return False
+        try:
+            if kind is not None: await connection.execute(f'ROLLBACK TO SAVEPOINT {self._name}')
+            await connection.execute(f'RELEASE SAVEPOINT {self._name}')
+        finally:
+            self._transaction._savepoints -= 1
+        return False
+
+    def __enter__(self) -> 'Transaction':
+        return self._transaction._synchronously(self.__aenter__())
+
+    def __exit__(self, kind, error, traceback):
+        return self._transaction._synchronously(self.__aexit__(kind, error, traceback))
+
+
+class Transaction(object):
+    """One connection pinned for the lifetime of the block. Queries built off tx.query
+    run on that connection instead of acquiring their own and are committed together
+    in a single COMMIT on a clean exit or rolled back when the block raises.
+
+    Everything else (vendor, statement caches, runner) is read off the engine so a
+    Transaction stands in for Supersql wherever a Query looks up its engine.
+    """
+    # reads inside the block may see its uncommitted writes, they are neither served
+    # from nor stored in the result cache and the tables written are only invalidated
+    # once the block commits or rolls back
+    _cacheable = False
+
+    def __init__(self, engine, isolation: str = None, readonly: bool = False):
+        self._engine = engine
+        self._isolation = isolation
+        self._readonly = readonly
+        self._acquiring = None
+        self._connection = None
+        self._transaction = None
+        self._savepoints = 0
+        self._written = set()
+
+    def __getattr__(self, name: str):
+        return getattr(self._engine, name)
+
+    @property
+    def _query_only(self) -> bool:
+        # pooled sqlite readers are query_only already, a lone connection is switched for the block
+        return self._readonly and not self._engine._pooled and self._engine.dialect.name == SQLITE
+
+    @asynccontextmanager
+    async def _acquire(self, write = False):
+        yield self.connection
+
+    def _wrote(self, tables: Iterable[str]):
+        self._written.update(tables)
+
+    def _synchronously(self, coroutine):
+        runner = self._engine._runner
+        if runner is None:
+            coroutine.close()
+            raise ValueError('with ssql.transaction() requires a synchronous connection i.e. Supersql.connects()')
+        return runner(coroutine)
+
+    async def _begin(self, connection):
+        isolation = self._isolation
+        dialect = self._engine.dialect
+        if isolation is not None and isolation not in dialect.isolation:
+            raise ValueError(f'{dialect.name} transaction isolation must be one of {", ".join(dialect.isolation)}')
+        if dialect.prepared:
+            self._transaction = connection.transaction(isolation=isolation, readonly=self._readonly)
+            await self._transaction.start()
+            return
+        if connection.in_transaction:
+            raise ValueError('Connection is already inside a transaction')
+        for statement in dialect.begin(isolation, self._readonly):
+            await connection.execute(statement)
+        if self._query_only: await connection.execute('PRAGMA query_only = 1')
+
+    async def _end(self, connection, commit: bool):
+        if self._engine.dialect.prepared:
+            transaction, self._transaction = self._transaction, None
+            if commit: await transaction.commit()
+            else: await transaction.rollback()
+            return
+        try:
+            if commit: await connection.commit()
+            else: await connection.rollback()
+        finally:
+            if self._query_only: await connection.execute('PRAGMA query_only = 0')
+
+    async def __aenter__(self) -> 'Transaction':
+        if self._connection is not None:
+            raise ValueError('Transaction is already active, use tx.savepoint() to nest')
+        acquiring = self._engine._acquire(write=not self._readonly)
+        connection = await acquiring.__aenter__()
+        try: await self._begin(connection)
+        except BaseException:
+            await acquiring.__aexit__(None, None, None)
+            raise
+        self._acquiring, self._connection = acquiring, connection
+        return self
+
+    async def __aexit__(self, kind, error, traceback):
+        acquiring, connection = self._acquiring, self._connection
+        self._acquiring = self._connection = None
+        try: await self._end(connection, kind is None)
+        finally:
+            try: await acquiring.__aexit__(None, None, None)
+            finally:
+                written, self._written = self._written, set()
+                if written: self._engine._wrote(written)
+        return False
+
+    def __enter__(self) -> 'Transaction':
+        return self._synchronously(self.__aenter__())
+
+    def __exit__(self, kind, error, traceback):
+        return self._synchronously(self.__aexit__(kind, error, traceback))
+
+    @property
+    def connection(self):
+        if self._connection is None:
+            raise ValueError('Transaction is not active, use async with ssql.transaction() as tx')
+        return self._connection
+
+    @property
+    def query(self) -> Query:
+        """Query bound to the pinned connection"""
+        return Query(self)
+
+    def savepoint(self) -> Savepoint:
+        return Savepoint(self)
@@ -0,0 +1,59 @@
+from unittest import TestCase
+
+from time import sleep
+
+from supersql.cache import LRU, Results
+
+
+class TestLRU(TestCase):
+    def test_hits_and_misses(self):
+        lru = LRU(2)
+        self.assertIsNone(lru.get('a'))
+        lru.put('a', 1)
+        self.assertEqual(lru.get('a'), 1)
+        self.assertEqual((lru.hits, lru.misses), (1, 1))
+
+    def test_eviction(self):
+        lru = LRU(2)
+        lru.put('a', 1)
+        lru.put('b', 2)
+        lru.get('a')
+        lru.put('c', 3)
+        self.assertIn('a', lru)
+        self.assertNotIn('b', lru)
+        self.assertEqual(lru.info()['evictions'], 1)
+        self.assertEqual(len(lru), 2)
+
+    def test_disabled(self):
+        lru = LRU(0)
+        self.assertEqual(lru.put('a', 1), 1)
+        self.assertEqual(len(lru), 0)
+        self.assertRaises(ValueError, LRU, -1)
+
+    def test_clear(self):
+        lru = LRU()
+        lru.put('a', 1)
+        lru.get('a')
+        lru.clear()
+        self.assertEqual(lru.info(), {'hits': 0, 'misses': 0, 'evictions': 0, 'size': 0, 'maxsize': 256})
+
+
+class TestResults(TestCase):
+    def test_ttl(self):
+        results = Results(4)
+        results.set('a', [1], 0.01, ['tab'])
+        self.assertEqual(results.get('a'), [1])
+        sleep(0.02)
+        self.assertIsNone(results.get('a'))
+        self.assertEqual(len(results), 0)
+
+    def test_invalidate(self):
+        results = Results(4)
+        results.set('a', [1], 60, ['tab', 'other'])
+        results.set('b', [2], 60, ['other'])
+        results.invalidate('tab')
+        self.assertIsNone(results.get('a'))
+        self.assertEqual(results.get('b'), [2])
+        results.set('a', [3], 60, ['tab'])
+        self.assertEqual(results.get('a'), [3])
+        self.assertEqual(results.info()['invalidations'], 1)
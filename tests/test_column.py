@@ -14,44 +14,47 @@ class TestField(TestCase):
     
     def test_field_eq(self):
         field = Column('id')
-        self.assertIsInstance(field == 5, Column)
-        self.assertEqual(field._sql, f'id = {SYM}')
-        self.assertEqual(field._arg, 5)
+        expression = field == 5
+        self.assertIsInstance(expression, Column)
+        self.assertEqual(expression._sql, f'id = {SYM}')
+        self.assertEqual(expression._arg, 5)
+        self.assertIsNone(field._sql)
+        self.assertIsNone(field._arg)
     
     def test_field_ge(self):
-        self.f >= 100
-        self.assertEqual(f'id >= {SYM}', self.f._sql)
-        self.assertEqual(self.f._arg, 100)
+        e = self.f >= 100
+        self.assertEqual(f'id >= {SYM}', e._sql)
+        self.assertEqual(e._arg, 100)
     
     def test_field_gt(self):
-        self.f > 100
-        self.assertEqual(f'id > {SYM}', self.f._sql())
-        self.assertEqual(self.f._arg, 100)
+        e = self.f > 100
+        self.assertEqual(f'id > {SYM}', e._sql())
+        self.assertEqual(e._arg, 100)
     
     def test_field_mul(self):
-        self.f * 100
-        self.assertEqual(f'id * {SYM}', self.f._sql())
-        self.assertEqual(self.f._arg, 100)
+        e = self.f * 100
+        self.assertEqual(f'id * {SYM}', e._sql())
+        self.assertEqual(e._arg, 100)
 
     def test_field_le(self):
-        self.f <= 100
-        self.assertEqual(f'id <= {SYM}', self.f._sql)
-        self.assertEqual(self.f._arg, 100)
+        e = self.f <= 100
+        self.assertEqual(f'id <= {SYM}', e._sql)
+        self.assertEqual(e._arg, 100)
     
     def test_field_lt(self):
-        self.f < 100
-        self.assertEqual(f'id < {SYM}', self.f._sql)
-        self.assertEqual(self.f._arg, 100)
+        e = self.f < 100
+        self.assertEqual(f'id < {SYM}', e._sql)
+        self.assertEqual(e._arg, 100)
     
     def test_field_mod_like(self):
-        self.f % 'abc'
-        self.assertEqual(f'id LIKE {SYM}', self.f._sql)
-        self.assertEqual(self.f._arg, '%abc%')
+        e = self.f % 'abc'
+        self.assertEqual(f'id LIKE {SYM}', e._sql)
+        self.assertEqual(e._arg, '%abc%')
     
     def test_field_ne(self):
-        self.f != 100
-        self.assertEqual(f'id <> {SYM}', self.f._sql)
-        self.assertEqual(self.f._arg, 100)
+        e = self.f != 100
+        self.assertEqual(f'id <> {SYM}', e._sql)
+        self.assertEqual(e._arg, 100)
     
     def test_field_coercion(self):
         f = Column('name')
@@ -64,17 +67,21 @@ class TestField(TestCase):
     def test_field_LIKE(self):
         f = Column('name')
 
-        f.LIKE('yimu', mask='%%')
-        self.assertEqual(f._arg, '%yimu%')
-
-        f.LIKE('yimu', mask='-%')
-        self.assertEqual(f._arg, 'yimu%')
-
-        f.LIKE('yimu', mask='%-')
-        self.assertEqual(f._arg, '%yimu')
+        self.assertEqual(f.LIKE('yimu', mask='%%')._arg, '%yimu%')
+        self.assertEqual(f.LIKE('yimu', mask='-%')._arg, 'yimu%')
+        self.assertEqual(f.LIKE('yimu', mask='%-')._arg, '%yimu')
+        self.assertIsNone(f._arg)
 
         self.assertRaises(ValueError, f.LIKE, 'abc', '')
     
     def test_field_AS(self):
-        f = Column('foo').AS('other')
+        column = Column('foo')
+        f = column.AS('other')
         self.assertEqual(str(f), 'foo AS other')
+        self.assertEqual(str(column), 'foo')
+
+    def test_field_gt_parameterize(self):
+        e = self.f > 100
+        e.parameterize = False
+        self.assertEqual(e._sql(), 'id > 100')
+        self.assertTrue(self.f.parameterize)
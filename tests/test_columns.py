@@ -0,0 +1,50 @@
+from array import array
+from sqlite3 import connect, Row
+from unittest import TestCase
+
+from supersql import Rows
+from supersql.columns import buffer, columns, infer
+
+
+class TestColumns(TestCase):
+    def setUp(self) -> None:
+        db = connect(':memory:')
+        db.row_factory = Row
+        self.records = db.execute(
+            "SELECT 1 AS id, 'obi' AS username, 1.5 AS score, NULL AS age "
+            "UNION ALL SELECT 2, 'ada', 2.5, 30"
+        ).fetchall()
+
+    def test_infer(self):
+        self.assertEqual(infer([None, True]), 'bool')
+        self.assertEqual(infer([None, 5]), 'int8')
+        self.assertEqual(infer([0.5]), 'float8')
+        self.assertIsNone(infer(['abc']))
+        self.assertIsNone(infer([None]))
+
+    def test_columns(self):
+        result = columns(self.records)
+        self.assertEqual(list(result), ['id', 'username', 'score', 'age'])
+        self.assertEqual(result['id'], array('q', [1, 2]))
+        self.assertEqual(result['score'], array('d', [1.5, 2.5]))
+        self.assertEqual(result['username'], ['obi', 'ada'])
+        self.assertEqual(result['age'], [None, 30])
+
+    def test_columns_mappings(self):
+        records = [{'id': 1, 'username': 'obi'}, {'id': 2, 'username': 'ada'}]
+        result = columns(records)
+        self.assertEqual(result['id'], array('q', [1, 2]))
+        self.assertEqual(result['username'], ['obi', 'ada'])
+
+    def test_columns_types(self):
+        result = columns(self.records, types=['int4', 'text', 'float4', 'int2'])
+        self.assertEqual(result['id'].typecode, 'i')
+        self.assertEqual(result['score'].typecode, 'f')
+        self.assertEqual(buffer((70000,), 'int2'), [70000])
+
+    def test_columns_empty(self):
+        self.assertEqual(columns([]), {})
+        self.assertEqual(columns([], names=['id'], types=['int8']), {'id': array('q')})
+
+    def test_rows_to_columns(self):
+        self.assertEqual(Rows(self.records).to_columns()['id'], array('q', [1, 2]))
@@ -0,0 +1,24 @@
+from asyncio import sleep
+from threading import current_thread
+from unittest import TestCase
+
+from supersql.helpers import Bridge, drive
+
+
+class TestHelpers(TestCase):
+    def test_drive(self):
+        async def immediate():
+            return 5
+
+        self.assertEqual(drive(immediate()), 5)
+        with self.assertRaises(RuntimeError):
+            drive(sleep(0))
+
+    def test_bridge(self):
+        async def thread():
+            await sleep(0)
+            return current_thread().name
+
+        bridge = Bridge()
+        try: self.assertEqual(bridge(thread()), 'supersql-bridge')
+        finally: bridge.stop()
@@ -0,0 +1,86 @@
+from collections import namedtuple
+from dataclasses import dataclass
+from sqlite3 import Row as LiteRow, connect
+from unittest import TestCase
+
+from pydantic import BaseModel, ValidationError
+
+from supersql import Rows
+from supersql.hydration import CONSTRUCTORS, hydrator
+
+
+@dataclass
+class Member:
+    id: int
+    username: str
+    age: int
+
+
+class Slotted(object):
+    __slots__ = ('age', 'id', 'username')
+
+    def __init__(self, age, id, username):
+        self.age, self.id, self.username = age, id, username
+
+
+class Loose(object):
+    def __init__(self, **columns):
+        self.columns = columns
+
+
+class Pydantic(BaseModel):
+    id: int
+    username: str
+    age: int
+
+
+class Shouting(BaseModel):
+    id: int
+    username: str
+    age: int
+
+    def model_post_init(self, context):
+        self.username = self.username.upper()
+
+
+Tuple = namedtuple('Tuple', 'id username age')
+Reordered = namedtuple('Reordered', 'age username id')
+
+
+class TestHydration(TestCase):
+    def setUp(self) -> None:
+        connection = connect(':memory:')
+        connection.row_factory = LiteRow
+        self.records = connection.execute(
+            "SELECT 1 AS id, 'obi' AS username, 40 AS age UNION ALL SELECT 2, 'ada', 'forty'"
+        ).fetchall()
+
+    def test_positional(self):
+        rows = Rows(self.records, Member)
+        self.assertEqual(rows[0], Member(1, 'obi', 40))
+        slotted = Rows(self.records, Slotted)[0]
+        self.assertEqual((slotted.id, slotted.username, slotted.age), (1, 'obi', 40))
+        self.assertEqual(list(Rows(self.records, Tuple))[0], Tuple(1, 'obi', 40))
+        self.assertEqual(Rows(self.records, Reordered)[0], Reordered(40, 'obi', 1))
+
+    def test_keywords(self):
+        self.assertEqual(Rows(self.records, Loose)[0].columns, {'id': 1, 'username': 'obi', 'age': 40})
+        self.assertEqual(Rows([{'age': 3, 'id': 9, 'username': 'ife'}], Member)[0], Member(9, 'ife', 3))
+
+    def test_pydantic(self):
+        rows = Rows(self.records, Pydantic)
+        self.assertEqual(rows[0], Pydantic(id=1, username='obi', age=40))
+        with self.assertRaises(ValidationError):
+            rows[1]
+        trusted = Rows(self.records, Pydantic, validate=False)
+        self.assertEqual(trusted[1].age, 'forty')
+        self.assertEqual(trusted[0].model_dump(), {'id': 1, 'username': 'obi', 'age': 40})
+        self.assertEqual(trusted[0].model_fields_set, {'id', 'username', 'age'})
+        self.assertFalse(trusted[:1]._validate)
+        self.assertEqual(Rows(self.records, Shouting, validate=False)[0].username, 'OBI')
+
+    def test_cached(self):
+        make = hydrator(Member, self.records[0])
+        self.assertIs(hydrator(Member, self.records[1]), make)
+        self.assertIsNot(hydrator(Member, self.records[0], validate=False), make)
+        self.assertIn((Member, ('id', 'username', 'age'), False, True), CONSTRUCTORS)
@@ -0,0 +1,82 @@
+from math import inf
+from unittest import TestCase
+
+from supersql import Supersql, Table
+from supersql.metrics import Execution, Histogram, Instruments, PoolMetrics
+
+
+class Pool(object):
+    def get_size(self): return 8
+    def get_idle_size(self): return 3
+    def get_min_size(self): return 2
+    def get_max_size(self): return 10
+
+
+class TestMetrics(TestCase):
+    def test_histogram(self):
+        histogram = Histogram((0.1, 1.0, inf))
+        for value in (0.05, 0.1, 0.5, 3.0):
+            histogram.observe(value)
+        snapshot = histogram.snapshot()
+        self.assertEqual(snapshot['buckets'], {0.1: 2, 1.0: 1, inf: 1})
+        self.assertEqual(snapshot['count'], 4)
+        self.assertEqual(snapshot['max'], 3.0)
+        self.assertAlmostEqual(snapshot['mean'], 0.9125)
+        self.assertEqual(Histogram().snapshot()['mean'], 0.0)
+
+    def test_pool_metrics(self):
+        metrics = PoolMetrics()
+        self.assertNotIn('in_use', metrics.snapshot())
+        snapshot = metrics.snapshot(Pool())
+        self.assertEqual((snapshot['size'], snapshot['idle'], snapshot['in_use']), (8, 3, 5))
+        self.assertEqual((snapshot['min_size'], snapshot['max_size']), (2, 10))
+
+
+class TestInstruments(TestCase):
+    def test_hooks_and_slow_log(self):
+        instruments = Instruments(slow=0.0)
+        seen = []
+        instruments.before(lambda execution: seen.append(('before', execution.sql)))
+
+        @instruments.after
+        def after(execution):
+            seen.append(('after', execution.rows))
+            raise RuntimeError('hooks never fail the query')
+
+        with self.assertLogs('supersql') as logs:
+            execution = instruments.start('SELECT 1', [], 0.001)
+            instruments.finish(execution, [1, 2])
+        self.assertEqual(seen, [('before', 'SELECT 1'), ('after', 2)])
+        self.assertIn('slow query', logs.output[0])
+        stats = instruments.snapshot()['SELECT 1']
+        self.assertEqual((stats['count'], stats['slow'], stats['rows'], stats['errors']), (1, 1, 2, 0))
+        self.assertEqual(stats['compile']['total'], 0.001)
+
+    def test_errors(self):
+        instruments = Instruments()
+        execution = instruments.start('SELECT', [])
+        instruments.finish(execution, error=ValueError())
+        self.assertIsInstance(execution, Execution)
+        self.assertEqual(instruments.snapshot()['SELECT']['errors'], 1)
+        instruments.reset()
+        self.assertEqual(instruments.snapshot(), {})
+
+    def test_query_instrumented(self):
+        ssql = Supersql('sqlite://:memory:')
+        ssql.connects()
+        tab = Table('tab')
+        ssql.query.RAW('CREATE TABLE tab (id INTEGER PRIMARY KEY)').run()
+        ssql.query.INSERT(tab.id).INTO(tab).VALUES((1,), (2,), (3,)).run()
+        executions = []
+        ssql.instruments.after(executions.append)
+        for _ in range(2): ssql.query.SELECT().FROM(tab).run()
+        ssql.disconnects()
+
+        stats = ssql.instruments.snapshot()['SELECT * FROM tab']
+        self.assertEqual((stats['count'], stats['rows']), (2, 6))
+        execution = executions[-1]
+        self.assertEqual(execution.rows, 3)
+        self.assertAlmostEqual(
+            execution.total, execution.compile + execution.acquire + execution.execute + execution.decode
+        )
+        self.assertIn('CREATE TABLE tab (id INTEGER PRIMARY KEY)', ssql.instruments.snapshot())
@@ -0,0 +1,90 @@
+from datetime import date, datetime
+from decimal import Decimal
+from unittest import IsolatedAsyncioTestCase, TestCase
+from uuid import uuid4
+
+from supersql import Page, Supersql, Table
+from supersql.pagination import detokenize, tokenize
+
+
+class TestTokens(TestCase):
+    def test_round_trip(self):
+        values = [1, 'obi', None, 2.5, True, datetime(2023, 5, 1, 12, 30), date(2023, 5, 1), Decimal('1.10'), uuid4(), b'\x00\x01']
+        self.assertEqual(detokenize(tokenize(values), len(values)), values)
+
+    def test_invalid(self):
+        self.assertRaises(ValueError, detokenize, 'not a token', 1)
+        self.assertRaises(ValueError, detokenize, tokenize([1, 2]), 1)
+        self.assertRaises(ValueError, tokenize, [object()])
+
+
+class TestPaginateSqlite(IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.ssql = Supersql('sqlite://:memory:')
+        await self.ssql.connect()
+        self.members = Table('members')
+        await self.ssql.query.RAW('CREATE TABLE members (id INTEGER PRIMARY KEY, username TEXT, age INTEGER)').go()
+        members = self.members
+        await self.ssql.query.INSERT(members.id, members.username, members.age).INTO(members).VALUES(
+            *[(n, f'user{n}', n % 7) for n in range(1, 101)], multirow=True
+        ).go()
+
+    async def asyncTearDown(self) -> None:
+        await self.ssql.disconnect()
+
+    async def test_paginate(self):
+        members = self.members
+        query = self.ssql.query.SELECT(members.id, members.age).FROM(members).WHERE(members.age > 2)
+        first = await query.PAGINATE([members.age, members.id], size=10).go()
+        self.assertIsInstance(first, Page)
+        self.assertEqual(len(first), 10)
+        second = await query.PAGINATE([members.age, members.id], after=first.token, size=10).go()
+        keys = [(row.age, row.id) for row in first] + [(row.age, row.id) for row in second]
+        self.assertEqual(keys, sorted(keys))
+        self.assertEqual(len(set(keys)), 20)
+        self.assertTrue(all(age > 2 for age, _ in keys))
+
+    async def test_pages(self):
+        members = self.members
+        seen = []
+        async for page in self.ssql.query.SELECT(members.id).FROM(members).pages([members.id], size=30):
+            seen.extend(row.id for row in page)
+        self.assertEqual(seen, list(range(1, 101)))
+
+        descending = []
+        async for page in self.ssql.query.SELECT(members.id).FROM(members).pages([members.id], size=25, descending=True):
+            descending.extend(row.id for row in page)
+        self.assertEqual(descending, list(range(100, 0, -1)))
+
+    async def test_pages_or(self):
+        members = self.members
+        query = self.ssql.query.SELECT(members.id).FROM(members).WHERE(members.age == 1).OR(members.age == 2)
+        self.assertEqual(
+            query.PAGINATE([members.id], after=tokenize([10]), size=5).compile(),
+            'SELECT id FROM members WHERE (age = ? OR age = ?) AND (id) > (?) ORDER BY id LIMIT 5'
+        )
+        seen = []
+        async for page in query.pages([members.id], size=10):
+            seen.extend(row.id for row in page)
+        self.assertEqual(seen, [n for n in range(1, 101) if n % 7 in (1, 2)])
+
+    async def test_pages_string_condition(self):
+        members = self.members
+        query = self.ssql.query.SELECT(members.id).FROM(members).WHERE('age = 0 OR age = ?', 6)
+        self.assertEqual(
+            query.PAGINATE([members.id], after=tokenize([10]), size=5).compile(),
+            'SELECT id FROM members WHERE (age = 0 OR age = ?) AND (id) > (?) ORDER BY id LIMIT 5'
+        )
+        seen = []
+        async for page in query.pages([members.id], size=10):
+            seen.extend(row.id for row in page)
+        self.assertEqual(seen, [n for n in range(1, 101) if n % 7 in (0, 6)])
+
+    async def test_paginate_errors(self):
+        members = self.members
+        query = self.ssql.query.SELECT(members.username).FROM(members)
+        with self.assertRaises(ValueError):
+            await query.PAGINATE([members.id], size=5).go()
+        self.assertRaises(ValueError, query.PAGINATE, [members.id], size=0)
+        self.assertRaises(ValueError, query.PAGINATE, [])
+        self.assertRaises(ValueError, query.LIMIT(5).PAGINATE, [members.id])
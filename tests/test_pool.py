@@ -0,0 +1,56 @@
+from asyncio import gather
+from os import path
+from tempfile import TemporaryDirectory
+from unittest import IsolatedAsyncioTestCase
+
+from pytest import mark
+
+from supersql import Supersql, Table
+from supersql.pool import LitePool
+
+
+@mark.asyncio
+class TestLitePool(IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.directory = TemporaryDirectory()
+        self.ssql = Supersql(f'sqlite://{path.join(self.directory.name, "pool.db")}')
+        await self.ssql.connect(pooled=True, max_size=3, pragmas={'cache_size': -2000})
+
+    async def asyncTearDown(self) -> None:
+        await self.ssql.disconnect()
+        self.directory.cleanup()
+
+    async def test_readers_and_writer(self):
+        pool = self.ssql._connexion
+        self.assertIsInstance(pool, LitePool)
+        self.assertEqual(pool.get_size(), 4)
+
+        await self.ssql.query.RAW('CREATE TABLE tab (id INTEGER PRIMARY KEY, username TEXT)').go()
+        tab = Table('tab')
+        await self.ssql.query.INSERT(tab.id, tab.username).INTO(tab).VALUES((1, 'obi'), (2, 'ada')).go()
+        results = await gather(*(self.ssql.query.SELECT().FROM(tab).go() for _ in range(6)))
+        self.assertEqual([len(rows) for rows in results], [2] * 6)
+        self.assertEqual(pool.get_idle_size(), 4)
+        self.assertEqual(self.ssql.pool_metrics['acquires'], 8)
+
+    async def test_pragmas(self):
+        pool = self.ssql._connexion
+        reader = await pool.acquire()
+        try:
+            journal = await reader.execute_fetchall('PRAGMA journal_mode')
+            cache = await reader.execute_fetchall('PRAGMA cache_size')
+            only = await reader.execute_fetchall('PRAGMA query_only')
+        finally: await pool.release(reader)
+        self.assertEqual(journal[0][0], 'wal')
+        self.assertEqual(cache[0][0], -2000)
+        self.assertEqual(only[0][0], 1)
+
+    async def test_invalid(self):
+        with self.assertRaises(ValueError):
+            LitePool(':memory:')
+        with self.assertRaises(ValueError):
+            LitePool('pool.db', readers=0)
+        with self.assertRaises(ValueError):
+            await Supersql('sqlite://:memory:').connect(pragmas={'journal_mode': 'WAL; DROP TABLE tab'})
+        with self.assertRaises(ValueError):
+            Supersql('sqlite://:memory:').connects(pragmas={'journal_mode': 'WAL; DROP TABLE tab'})
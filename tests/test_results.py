@@ -0,0 +1,56 @@
+from dataclasses import dataclass
+from sqlite3 import connect, Row as LiteRow
+from unittest import TestCase
+
+from supersql import Row, Rows
+
+
+@dataclass
+class Member:
+    id: int
+    username: str
+
+
+class TestRows(TestCase):
+    def setUp(self) -> None:
+        db = connect(':memory:')
+        db.row_factory = LiteRow
+        self.records = db.execute(
+            "SELECT 1 AS id, 'obi' AS username UNION ALL SELECT 2, 'ada' UNION ALL SELECT 3, 'ife'"
+        ).fetchall()
+
+    def test_row_attribute_access(self):
+        row = Row(self.records[0])
+        self.assertEqual(row.username, 'obi')
+        self.assertEqual(row['id'], 1)
+        self.assertEqual(row.column(1), 'obi')
+        self.assertEqual(row.keys(), ['id', 'username'])
+        self.assertEqual(len(row), 2)
+        self.assertFalse(hasattr(row, 'email'))
+        with self.assertRaises(AttributeError):
+            row.anything = 5
+
+    def test_row_repr(self):
+        self.assertEqual(repr(Row(self.records[0])), "<Row {'id': 1, 'username': 'obi'}>")
+        self.assertEqual(repr(Row({'id': 1, 'username': 'obi'})), "<Row {'id': 1, 'username': 'obi'}>")
+
+    def test_rows_reiterable(self):
+        rows = Rows(self.records)
+        self.assertEqual([row.id for row in rows], [1, 2, 3])
+        self.assertEqual([row.id for row in rows], [1, 2, 3])
+
+    def test_rows_indexing_and_slicing(self):
+        rows = Rows(self.records, Member)
+        self.assertEqual(rows[0], Member(1, 'obi'))
+        self.assertEqual(rows[-1].username, 'ife')
+        self.assertIsInstance(rows[1:], Rows)
+        self.assertEqual(list(rows[1:]), [Member(2, 'ada'), Member(3, 'ife')])
+        self.assertEqual(rows.row(1), Member(1, 'obi'))
+        self.assertRaises(IndexError, rows.row, 0)
+        self.assertIs(rows.rows, self.records)
+
+    def test_rows_empty(self):
+        rows = Rows([])
+        self.assertFalse(rows)
+        self.assertEqual(len(rows), 0)
+        self.assertEqual(list(rows), [])
@@ -0,0 +1,87 @@
+from os import path
+from tempfile import TemporaryDirectory
+from unittest import IsolatedAsyncioTestCase, TestCase
+
+from supersql import Supersql
+from supersql.schema import Reflected, kind
+
+
+DDL = (
+    'CREATE TABLE employees (id INTEGER PRIMARY KEY, email TEXT NOT NULL, age INT, salary REAL)',
+    'CREATE INDEX employees_email ON employees (email)',
+    'CREATE TABLE teams (id INTEGER PRIMARY KEY, name TEXT)',
+)
+
+
+class TestSchema(TestCase):
+    def setUp(self) -> None:
+        self.directory = TemporaryDirectory()
+        self.snapshot = path.join(self.directory.name, 'schema.json')
+        self.ssql = Supersql('sqlite://:memory:', schema_snapshot=self.snapshot)
+        self.ssql.connects()
+        for ddl in DDL: self.ssql.query.RAW(ddl).run()
+
+    def tearDown(self) -> None:
+        self.ssql.disconnects()
+        self.directory.cleanup()
+
+    def test_reflect_table(self):
+        employees = self.ssql.query.database.table('employees')
+        self.assertIsInstance(employees, Reflected)
+        schema = employees.__schema__
+        self.assertEqual(schema.columns, ['id', 'email', 'age', 'salary'])
+        self.assertEqual(schema.primary_key, ['id'])
+        self.assertEqual(schema.indexes, {'employees_email': ['email']})
+        self.assertFalse(schema.fields['email'].nullable)
+        self.assertEqual(schema.types(['age', 'salary', 'email']), ['int8', 'float8', None])
+        self.assertIs(employees.email, employees.email)
+        self.assertRaises(AttributeError, getattr, employees, 'mail')
+
+    def test_reflect_cached(self):
+        database = self.ssql.database
+        database.reflects()
+        self.assertEqual(database.reflections, 1)
+        self.assertIn('teams', database)
+        self.assertIs(database.table('teams'), database.table('teams'))
+        database.reflects('teams', 'employees')
+        self.assertEqual(database.reflections, 1)
+        database.reflects('teams', refresh=True)
+        self.assertEqual(database.reflections, 2)
+        self.assertRaises(ValueError, database.table, 'missing')
+
+    def test_reflect_snapshot(self):
+        self.ssql.database.reflects()
+        self.assertTrue(path.exists(self.snapshot))
+        ssql = Supersql('sqlite://:memory:', schema_snapshot=self.snapshot)
+        self.assertIn('employees', ssql.database)
+        self.assertEqual(ssql.database.table('employees').__schema__.primary_key, ['id'])
+        self.assertEqual(ssql.database.reflections, 0)
+
+    def test_reflect_ttl(self):
+        self.assertRaises(ValueError, Supersql, 'sqlite://:memory:', schema_ttl=-1)
+        ssql = Supersql('sqlite://:memory:', schema_ttl=0)
+        ssql.connects()
+        ssql.query.RAW(DDL[2]).run()
+        ssql.database.table('teams')
+        ssql.database.table('teams')
+        self.assertEqual(ssql.database.reflections, 2)
+        ssql.disconnects()
+
+    def test_kind(self):
+        self.assertEqual(kind('postgres', 'int4'), 'int4')
+        self.assertEqual(kind('sqlite', 'BIGINT'), 'int8')
+        self.assertEqual(kind('sqlite', 'DOUBLE PRECISION'), 'float8')
+        self.assertEqual(kind('sqlite', 'BOOLEAN'), 'bool')
+        self.assertIsNone(kind('sqlite', 'VARCHAR(20)'))
+
+
+class TestSchemaAsync(IsolatedAsyncioTestCase):
+    async def test_reflect(self):
+        ssql = Supersql('sqlite://:memory:')
+        await ssql.connect()
+        await ssql.query.RAW(DDL[2]).go()
+        self.assertRaises(ValueError, ssql.database.table, 'teams')
+        schemas = await ssql.database.reflect('teams')
+        self.assertEqual(schemas['teams'].columns, ['id', 'name'])
+        self.assertEqual(str(ssql.database.table('teams').name), 'name')
+        await ssql.disconnect()
@@ -1,3 +1,4 @@
+from asyncio import TimeoutError, sleep
 from os import path, remove
 from unittest import TestCase, IsolatedAsyncioTestCase
 
@@ -9,7 +10,8 @@ from asyncpg.exceptions import InvalidAuthorizationSpecificationError
 from pytest import mark
 
 # src code
-from supersql import Supersql, Query
+from supersql import Supersql, Query, Table
+from supersql.helpers import Synchronous
 from supersql.constants import POSTGRES_LIVE_DSN
 
 
@@ -25,22 +27,122 @@ class TestSupersql(TestCase):
     
     def test_supersql_synchronous_connect(self):
         ssql = Supersql(TESTING_DSN)
-        self.assertRaises(NotImplementedError, ssql.connects)
-    
-    def test_supersql_synchronous_disconnect(self):
-        ssql = Supersql(TESTING_DSN)
-        self.assertRaises(NotImplementedError, ssql.disconnects)
+        self.assertRaises(ValueError, ssql.connects)
+        self.assertRaises(ValueError, ssql.query.SELECT().FROM('tab').run)
+
+    def test_supersql_synchronous_sqlite(self):
+        ssql = Supersql('sqlite://:memory:')
+        ssql.connects()
+        self.assertIsInstance(ssql._connexion, Synchronous)
+        ssql.query.RAW('CREATE TABLE tab (id INTEGER PRIMARY KEY, username TEXT)').run()
+        tab = Table('tab')
+        ssql.query.INSERT(tab.id, tab.username).INTO(tab).VALUES((1, 'obi'), (2, 'ada')).run()
+        ssql.query.INSERT(tab.id, tab.username).INTO(tab).VALUES((3, 'ife')).run()
+        self.assertFalse(ssql._connexion.in_transaction)
+        rows = ssql.query.SELECT(tab.username).FROM(tab).WHERE(tab.id >= 2).run()
+        self.assertEqual([row.username for row in rows], ['ada', 'ife'])
+        ssql.disconnects()
+        self.assertIsNone(ssql._connexion)
     
     def test_supersql_select(self):
         ssql = Supersql(TESTING_DSN)
         self.assertIsInstance(ssql.query, Query)
     
+    def test_supersql_pool_configuration(self):
+        ssql = Supersql(TESTING_DSN)
+        with self.assertRaises(ValueError):
+            ssql.connects(pooled=True, min_size=5, max_size=2)
+        ssql._configure(True, 1, 4, 100, 60.0, 0.5)
+        self.assertEqual(ssql._pool, {
+            'min_size': 1, 'max_size': 4, 'max_queries': 100, 'max_inactive_connection_lifetime': 60.0
+        })
+        self.assertEqual(ssql._acquire_timeout, 0.5)
+
     def test_vendor_unsettable(self):
         ssql = Supersql(TESTING_DSN)
         with self.assertRaises(ValueError):
             ssql.vendor = 'oracle'
 
 
+class Pool(object):
+    def __init__(self, delay = 0):
+        self.delay = delay
+        self.released = []
+
+    async def acquire(self, timeout = None):
+        if timeout is not None and self.delay > timeout: raise TimeoutError()
+        await sleep(self.delay)
+        return 'connection'
+
+    async def release(self, connection):
+        self.released.append(connection)
+
+    def get_size(self): return 2
+    def get_idle_size(self): return 1
+    def get_min_size(self): return 1
+    def get_max_size(self): return 2
+
+
+@mark.asyncio
+class TestSupersqlPool(IsolatedAsyncioTestCase):
+    async def test_acquire_metrics(self):
+        ssql = Supersql(POSTGRES_LIVE_DSN)
+        ssql._configure(True, 1, 2, 100, 60.0, 0.05)
+        ssql._vendor, ssql._connexion = 'postgres', Pool(0.01)
+        async with ssql._acquire() as conn:
+            self.assertEqual(conn, 'connection')
+        self.assertEqual(ssql._connexion.released, ['connection'])
+        ssql._connexion.delay = 1
+        with self.assertRaises(TimeoutError):
+            async with ssql._acquire(): pass
+        metrics = ssql.pool_metrics
+        self.assertEqual((metrics['acquires'], metrics['timeouts'], metrics['in_use']), (1, 1, 1))
+        self.assertGreaterEqual(metrics['wait']['max'], 0.01)
+
+    async def test_ping(self):
+        ssql = Supersql('sqlite://:memory:')
+        self.assertFalse(await ssql.ping())
+        await ssql.connect()
+        self.assertTrue(await ssql.ping())
+        await ssql.disconnect()
+        self.assertEqual(ssql.pool_metrics['failures'], 1)
+
+    async def test_gather(self):
+        running, peak = [0], [0]
+
+        class Slow(object):
+            def __init__(self, n): self.n = n
+            async def go(self, Model = None, format = 'rows'):
+                running[0] += 1
+                peak[0] = max(peak[0], running[0])
+                await sleep(0.01 * (5 - self.n))
+                running[0] -= 1
+                return self.n
+
+        ssql = Supersql(POSTGRES_LIVE_DSN)
+        ssql._configure(True, 1, 3, 100, 60.0, None)
+        self.assertEqual(await ssql.gather(*[Slow(n) for n in range(5)]), [0, 1, 2, 3, 4])
+        self.assertEqual(peak[0], 3)
+        peak[0] = 0
+        self.assertEqual(await ssql.gather(*[Slow(n) for n in range(5)], limit=2), [0, 1, 2, 3, 4])
+        self.assertEqual(peak[0], 2)
+        with self.assertRaises(ValueError):
+            await ssql.gather(Slow(0), limit=0)
+
+    async def test_gather_sqlite(self):
+        ssql = Supersql('sqlite://:memory:')
+        await ssql.connect()
+        tab = Table('tab')
+        await ssql.query.RAW('CREATE TABLE tab (id INTEGER PRIMARY KEY, username TEXT)').go()
+        await ssql.query.INSERT(tab.id, tab.username).INTO(tab).VALUES((1, 'obi'), (2, 'ada')).go()
+        first, second = await ssql.gather(
+            ssql.query.SELECT(tab.username).FROM(tab).WHERE(tab.id == 2),
+            ssql.query.SELECT(tab.username).FROM(tab).WHERE(tab.id == 1),
+        )
+        self.assertEqual((first[0].username, second[0].username), ('ada', 'obi'))
+        await ssql.disconnect()
+
+
 @mark.asyncio
 class TestSupersqlAsync(IsolatedAsyncioTestCase):
     async def test_supersql_pg_connection_error(self):
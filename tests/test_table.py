@@ -28,3 +28,13 @@ class TestTable(TestCase):
     def test_table_alias_field(self):
         table = Table('boo').AS('b')
         self.assertEqual(str(table.username), 'b.username')
+
+    def test_table_column_cached(self):
+        table = Table('cached')
+        self.assertIs(table.username, table.username)
+        table.username == 'yimu'
+        self.assertIsNone(table.username._sql)
+
+    def test_table_dunder_not_column(self):
+        table = Table('dunder')
+        self.assertRaises(AttributeError, getattr, table, '__wrapped__')
@@ -0,0 +1,70 @@
+from unittest import TestCase
+
+from supersql import Param, Supersql, Table, Template
+from supersql.constants import POSTGRES
+
+
+class TestTemplate(TestCase):
+    def setUp(self) -> None:
+        self.ssql = Supersql('sqlite://:memory:')
+        self.ssql.connects()
+        self.ssql.query.RAW('CREATE TABLE users (id INTEGER PRIMARY KEY, email TEXT, age INTEGER)').run()
+        self.users = Table('users')
+
+    def tearDown(self) -> None:
+        self.ssql.disconnects()
+
+    def test_template(self):
+        users = self.users
+        insert = self.ssql.query.INSERT(users.id, users.email, users.age).INTO(users).VALUES(
+            (Param('id'), Param('email'), 30)
+        ).template()
+        for n in range(1, 6): insert.run(id=n, email=f'user{n}@example.org')
+
+        select = self.ssql.query.SELECT(users.email).FROM(users).WHERE(
+            users.id >= Param('low')
+        ).AND(users.age == 30).AND(users.id <= Param('high')).template()
+        self.assertIsInstance(select, Template)
+        self.assertEqual(select.names, frozenset({'low', 'high'}))
+        self.assertEqual(select.bind({'low': 2, 'high': 3}), [2, 30, 3])
+        self.assertEqual([row.email for row in select.run(low=2, high=3)], ['user2@example.org', 'user3@example.org'])
+        self.assertEqual(len(select.run(low=1, high=5)), 5)
+        self.assertEqual(select._sql, 'SELECT email FROM users WHERE id >= ? AND age = ? AND id <= ?')
+
+    def test_template_parameters(self):
+        users = self.users
+        select = self.ssql.query.SELECT().FROM(users).WHERE(users.id == Param('id')).template()
+        with self.assertRaises(ValueError):
+            select.bind({})
+        with self.assertRaises(ValueError):
+            select.bind({'id': 1, 'email': 'a'})
+        with self.assertRaises(ValueError):
+            Param('not valid')
+        with self.assertRaises(ValueError):
+            self.ssql.query.INSERT(users.id).INTO(users).VALUES((1,), (2,)).template()
+
+    def test_template_in(self):
+        users = self.users
+        for n in range(1, 6):
+            self.ssql.query.INSERT(users.id, users.email, users.age).INTO(users).VALUES((n, f'user{n}', 30)).run()
+        select = self.ssql.query.SELECT(users.id).FROM(users).WHERE(users.id).IN(Param('ids')).template()
+        self.assertEqual(select.names, frozenset({'ids'}))
+        self.assertEqual(select.compile(), 'SELECT id FROM users WHERE id IN (SELECT value FROM json_each(?))')
+        self.assertEqual(select.bind({'ids': [1, 3]}), ['[1, 3]'])
+        self.assertEqual([row.id for row in select.run(ids=[2, 4, 5])], [2, 4, 5])
+
+    def test_template_pg(self):
+        users = self.users
+        ssql = Supersql('testing://development')
+        ssql._vendor = POSTGRES
+        update = ssql.query.UPDATE(users).SET(email=Param('email')).WHERE(users.id == Param('id')).template()
+        self.assertEqual(update.compile(), 'UPDATE users SET email = $1 WHERE id = $2')
+        self.assertEqual(update.bind({'id': 7, 'email': 'a@b.c'}), ['a@b.c', 7])
+
+    def test_template_in_pg(self):
+        users = self.users
+        ssql = Supersql('testing://development')
+        ssql._vendor = POSTGRES
+        select = ssql.query.SELECT().FROM(users).WHERE(users.id).IN(Param('ids')).AND(users.age > Param('age')).template()
+        self.assertEqual(select.compile(), 'SELECT * FROM users WHERE id = ANY($1) AND age > $2')
+        self.assertEqual(select.bind({'ids': (1, 2), 'age': 30}), [[1, 2], 30])